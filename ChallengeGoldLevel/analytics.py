@@ -0,0 +1,90 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from columnar import COLUMNAR_FORMATS, read_columnar
+from text_cleaner import file_sha1
+from label_index import LABEL_COLUMNS, LabelIndex
+
+# Kolom yang dipakai untuk heatmap korelasi
+HS_COLUMNS = ['HS', 'HS_Individual', 'HS_Group', 'HS_Religion', 'HS_Race', 'HS_Physical',
+              'HS_Gender', 'HS_Other', 'HS_Weak', 'HS_Moderate', 'HS_Strong']
+
+# Versi format cache agregat; naikkan jika isi compute_analytics berubah
+ANALYTICS_FORMAT = 1
+
+
+# Hitung semua agregat label dari DataFrame berisi kolom label
+def compute_analytics(labels):
+    return analytics_from_index(LabelIndex.from_frame(labels))
+
+
+# Semua agregat diturunkan langsung dari index label bit-packed: matriks co-occurrence G
+# (diagonal = jumlah tweet berlabel 1, G[i, j] = jumlah tweet dengan label i dan j sekaligus)
+# memberi distribusi, crosstab HS/Abusive, dan korelasi Pearson sekaligus.
+def analytics_from_index(index):
+    rows = len(index)
+    cooccurrence = index.cooccurrence(LABEL_COLUMNS)
+    ones = np.diag(cooccurrence)
+
+    distributions = {column: {"0": int(rows - ones[i]), "1": int(ones[i])}
+                     for i, column in enumerate(LABEL_COLUMNS)}
+
+    (neither, abusive_only), (hs_only, both) = index.crosstab('HS', 'Abusive').tolist()
+    hs_abusive = {"HS & Abusive": both, "HS Only": hs_only, "Abusive Only": abusive_only, "Neither": neither}
+    # Urutan kategori mengikuti kemunculan pertama di dataset, sama seperti countplot pada versi lama
+    category_codes = (index.select(all_of=('HS',)) * 2 + index.select(all_of=('Abusive',))).astype(np.int8)
+    code_names = {3: "HS & Abusive", 2: "HS Only", 1: "Abusive Only", 0: "Neither"}
+    codes, first_seen = np.unique(category_codes, return_index=True)
+    hs_abusive_order = [code_names[int(code)] for code in codes[np.argsort(first_seen)]]
+
+    correlation = index.correlation(HS_COLUMNS)
+    return {
+        "rows": rows,
+        "distributions": distributions,
+        "hs_abusive": hs_abusive,
+        "hs_abusive_order": hs_abusive_order,
+        "correlation_columns": HS_COLUMNS,
+        "correlation": [[None if np.isnan(value) else float(value) for value in row] for row in correlation],
+        "cooccurrence": cooccurrence.tolist(),
+    }
+
+
+# Matriks korelasi sebagai DataFrame (untuk heatmap)
+def correlation_frame(analytics):
+    columns = analytics["correlation_columns"]
+    return pd.DataFrame(analytics["correlation"], index=columns, columns=columns, dtype=float)
+
+
+# Muat agregat dari cache jika hash dataset sama; jika tidak, baca hanya kolom label lalu hitung ulang.
+# dataset_path boleh CSV, file kolumnar (.parquet/.feather), atau index label (.labels.npy).
+def load_analytics(dataset_path, cache_path=None):
+    dataset_hash = file_sha1(dataset_path)
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached["format"] == ANALYTICS_FORMAT and cached["dataset_sha1"] == dataset_hash:
+                return cached["analytics"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable analytics cache {cache_path}: {e}")
+
+    if dataset_path.endswith('.npy'):
+        index = LabelIndex.load(dataset_path)
+    else:
+        if dataset_path.endswith(tuple(COLUMNAR_FORMATS.values())):
+            labels = read_columnar(dataset_path, columns=LABEL_COLUMNS)
+        else:
+            labels = pd.read_csv(dataset_path, usecols=LABEL_COLUMNS,
+                                 dtype={column: np.int8 for column in LABEL_COLUMNS},
+                                 encoding='utf-8', encoding_errors='replace')
+        index = LabelIndex.from_frame(labels)
+    analytics = analytics_from_index(index)
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"format": ANALYTICS_FORMAT, "dataset_sha1": dataset_hash, "analytics": analytics}, f)
+        os.replace(tmp_path, cache_path)
+    return analytics
@@ -1,97 +1,624 @@
 import os
+import io
+import time
+import hashlib
+import hmac
+import csv
+import json
+import shutil
+import itertools
+import tempfile
+import argparse
+import threading
 import pandas as pd
-import re
 import sqlite3
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, g, send_file
 from flasgger import Swagger
 import yaml
 
+from text_cleaner import CLEAN_STAGES, read_decoded_csv, read_decoded_csv_chunks, load_text_cleaner
+from result_cache import CleanResultCache
+from metrics import Metrics, InstrumentedCleaner
+from dictionary_reloader import DictionaryReloader
+from columnar import COLUMNAR_FORMATS, ColumnarWriter, columnar_path, save_columnar, columnar_is_fresh
+from label_index import LABEL_COLUMNS, LabelIndex, LabelIndexWriter
+from tokenized_corpus import TokenizedCorpus, TokenizedCorpusWriter
+from tweet_search import TweetSearch, SEARCH_DEFAULT_LIMIT
+from job_queue import JobQueue, QueueFull
+from profiling import RequestProfiler, StageTimer
+from serialization import RESPONSE_FORMATS, COMPRESSION_WBITS, encode_frame, encode_ndjson, compress, compress_stream
+from term_index import (TermIndex, TOP_TERMS_DEFAULT_K, ensure_term_counts_table, batch_term_deltas,
+                        add_term_counts, apply_term_deltas, label_occurrences)
+
+# Jumlah baris per potongan saat /upload_csv dibaca secara streaming
+UPLOAD_CHUNK_SIZE = 5000
+# Upload lebih besar dari ini (byte) disalin ke file sementara di disk, bukan ke memori
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Format respons streaming /upload_csv yang dipilih lewat header Accept
+STREAM_MIMETYPES = ['application/x-ndjson', 'text/csv']
+
+# Kompresi respons (gzip/deflate sesuai Accept-Encoding) untuk respons JSON/NDJSON/CSV di atas
+# COMPRESSION_MIN_BYTES. Level 1 dipilih karena level lebih tinggi jauh lebih lambat dengan hasil
+# hanya sedikit lebih kecil untuk teks tweet.
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', '1'))
+
+# Batas /clean_batch: jumlah teks per request dan ukuran body JSON (byte)
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', '1000'))
+BATCH_MAX_BYTES = int(os.environ.get('BATCH_MAX_BYTES', str(2 * 1024 * 1024)))
+
+# Lokasi file data mentah dan artefak kamus hasil kompilasi
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(CURRENT_DIR, 'data/dataset.csv')
+ABUSIVE_PATH = os.path.join(CURRENT_DIR, 'data/abusive.csv')
+KAMUSALAY_PATH = os.path.join(CURRENT_DIR, 'data/new_kamusalay.csv')
+CLEANER_ARTIFACT_PATH = os.path.join(CURRENT_DIR, 'cache/text_cleaner.pkl')
+
+# Hasil cleansing dataset dan manifest-nya (hash per baris + versi kamus) untuk mode inkremental
+CLEANED_DATASET_PATH = 'data/cleaned_dataset_final.csv'
+MANIFEST_PATH = 'data/cleaned_dataset_final.manifest.json'
+MANIFEST_FORMAT = 1
+
+# Jumlah baris per potongan pada ingest streaming (main dengan stream=True / --stream)
+STREAM_CHUNK_SIZE = 20000
+
 # Fungsi untuk memuat file dan membersihkan data dari file CSV mentah
 def load_and_clean_data():
-    # Dapatkan path absolut
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    dataset_path = os.path.join(current_dir, 'data/dataset.csv')
-    abusive_path = os.path.join(current_dir, './data/abusive.csv')
-    kamusalay_path = os.path.join(current_dir, './data/new_kamusalay.csv')
-
-    # Membaca file CSV
     try:
-        # Membaca file CSV dalam mode byte
-        with open(dataset_path, 'rb') as f:
-            raw_data = f.read()
-        with open(abusive_path, 'rb') as f:
-            raw_abusive = f.read()
-        with open(kamusalay_path, 'rb') as f:
-            raw_kamusalay = f.read()
-
-        # Decode byte data dengan errors='replace' untuk karakter yang tidak bisa di-decode
-        decoded_data = raw_data.decode('utf-8', errors='replace')
-        decoded_abusive = raw_abusive.decode('utf-8', errors='replace')
-        decoded_kamusalay = raw_kamusalay.decode('utf-8', errors='replace')
-
-        # Simpan data yang sudah didecode ke dalam CSV sementara (sebagai string)
-        with open('data/decoded_dataset.csv', 'w', encoding='utf-8') as f:
-            f.write(decoded_data)
-        with open('data/decoded_abusive.csv', 'w', encoding='utf-8') as f:
-            f.write(decoded_abusive)
-        with open('data/decoded_kamusalay.csv', 'w', encoding='utf-8') as f:
-            f.write(decoded_kamusalay)
-
-        # Membaca kembali file CSV yang sudah dibersihkan ke dalam pandas
-        dataset = pd.read_csv('data/decoded_dataset.csv')
-        abusive_words = pd.read_csv('data/decoded_abusive.csv')
-        kamusalay = pd.read_csv('data/decoded_kamusalay.csv', header=None, names=['alay_word', 'normal_word'])
-        
+        # Decode byte data dengan errors='replace' langsung di memori, tanpa CSV sementara
+        dataset = read_decoded_csv(DATASET_PATH)
+
+        # Kamus dimuat dari artefak di disk jika new_kamusalay.csv dan abusive.csv tidak berubah
+        cleaner = load_text_cleaner(KAMUSALAY_PATH, ABUSIVE_PATH, CLEANER_ARTIFACT_PATH)
+
         print("Files loaded and cleaned successfully")
-        return dataset, abusive_words, kamusalay
+        return dataset, cleaner
     except Exception as e:
         print(f"Error loading or decoding files: {e}")
-        return None, None, None
-
-# Fungsi pembersihan teks
-def cleansing_text(text, kamusalay, abusive_words):
-    text = text.lower()
-    text = re.sub(r'\\x[\da-fA-F]{2}|\\n|\\t|[\t]', ' ', text)  # Hapus escape chars
-    text = re.sub(r'(\d\s*)+', ' ', text)  # Hapus urutan angka yang tidak relevan
-    
-    for _, row in kamusalay.iterrows():
-        text = re.sub(r'\b{}\b'.format(re.escape(row['alay_word'])), row['normal_word'], text, flags=re.IGNORECASE)
-    for word in abusive_words['ABUSIVE']:
-        text = re.sub(r'\b{}\b'.format(re.escape(word)), '', text, flags=re.IGNORECASE)
-
-    text = re.sub(r'(\b\w+)(\d+)', lambda x: f"{x.group(1)}-{x.group(1)}", text)  # Tangani pengulangan
-    text = re.sub(r'[^a-zA-Z\s]', '', text).strip()  # Hapus karakter non-alfabet
-    return text
-
-# Fungsi untuk menyimpan data ke dalam SQLite
-def save_to_sqlite(dataset):
-    try:
-        conn = sqlite3.connect('tweets.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cleaned_tweets (
-                id INTEGER PRIMARY KEY,
-                original_tweet TEXT,
-                cleaned_tweet TEXT
-            )
+        return None, None
+
+# Lokasi database SQLite dan pengaturan PRAGMA yang dipakai saat menulis
+SQLITE_DB_PATH = 'tweets.db'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',   # Pembaca tidak terblokir saat ada penulisan
+    'synchronous': 'NORMAL', # Cukup aman di mode WAL, jauh lebih cepat dari FULL
+    'cache_size': -64000,    # Nilai negatif = KiB (sekitar 64 MB)
+}
+# Jumlah baris per executemany saat menyimpan ke SQLite
+SQLITE_BATCH_SIZE = 5000
+
+# Instrumentasi (waktu per tahap cleansing, latensi request) untuk /metrics; METRICS_ENABLED=0 mematikannya total
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+TIMED_ENDPOINTS = ('clean_text', 'clean_batch', 'upload_csv')
+
+# Pengaturan cache hasil /clean_text (LRU di memori + tabel clean_cache di SQLITE_DB_PATH).
+# CACHE_MAX_PERSISTENT_ENTRIES membatasi jumlah baris clean_cache supaya input API tidak membesarkan tweets.db terus.
+CACHE_MAX_ENTRIES = 10000
+CACHE_MAX_TEXT_LENGTH = 2000
+CACHE_MAX_PERSISTENT_ENTRIES = int(os.environ.get('CACHE_MAX_PERSISTENT_ENTRIES', '100000'))
+
+# Hot-reload kamus: interval (detik) pemantauan file kamus, 0 = mati (reload hanya lewat endpoint admin).
+# Reload lewat endpoint admin dicatat di SQLITE_DB_PATH; setiap proses (worker gunicorn) memeriksanya setiap
+# DICTIONARY_POLL_INTERVAL detik dan ikut reload. Endpoint /admin/* mewajibkan header X-Admin-Token yang sama
+# dengan ADMIN_TOKEN; tanpa ADMIN_TOKEN semua endpoint /admin/* dimatikan (403), karena setiap reload
+# membuat semua worker membangun ulang kamus.
+DICTIONARY_WATCH_INTERVAL = float(os.environ.get('DICTIONARY_WATCH_INTERVAL', '0'))
+DICTIONARY_POLL_INTERVAL = float(os.environ.get('DICTIONARY_POLL_INTERVAL', '2'))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Profiling per request (opt-in): dengan PROFILING_ENABLED=1, request ke TIMED_ENDPOINTS yang membawa header
+# X-Profile: 1 atau ?profile=1 dan X-Admin-Token yang benar dijalankan di bawah cProfile. Karena laporan profil
+# memuat isi kode dan waktu per fungsi, PROFILING_ENABLED=1 tanpa ADMIN_TOKEN ditolak saat startup.
+# Laporan disimpan di PROFILE_DIR dan bisa diambil lewat /admin/profiles/<id>. Paling sering satu request
+# per PROFILE_MIN_INTERVAL detik per proses; permintaan lain dilayani biasa tanpa profiler.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+PROFILE_DIR = os.path.join(CURRENT_DIR, 'profiles')
+PROFILE_MIN_INTERVAL = float(os.environ.get('PROFILE_MIN_INTERVAL', '10'))
+
+# Antrean job untuk CSV besar (/upload_csv?async=1). Status job disimpan di tabel jobs pada SQLITE_DB_PATH,
+# upload dan hasilnya di JOB_STORAGE_DIR. JOB_WORKERS = thread worker per proses web (0 = hanya worker
+# terpisah lewat --job-worker), JOB_MAX_RUNNING = batas job bersamaan untuk semua worker,
+# JOB_MAX_PENDING = batas job queued + running sebelum upload baru ditolak dengan 429,
+# JOB_RETENTION_HOURS = lama job done/failed beserta file hasilnya disimpan sebelum dihapus.
+JOB_STORAGE_DIR = os.path.join(CURRENT_DIR, 'jobs')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '1'))
+JOB_MAX_RUNNING = int(os.environ.get('JOB_MAX_RUNNING', '2'))
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', '20'))
+JOB_RETENTION_HOURS = float(os.environ.get('JOB_RETENTION_HOURS', '24'))
+JOB_RETRY_AFTER = 30
+
+# Trigger yang menjaga cleaned_tweets_fts tetap sinkron dengan cleaned_tweets
+FTS_TRIGGERS = {
+    'cleaned_tweets_fts_insert': '''
+        CREATE TRIGGER IF NOT EXISTS cleaned_tweets_fts_insert AFTER INSERT ON cleaned_tweets BEGIN
+            INSERT INTO cleaned_tweets_fts (rowid, cleaned_tweet) VALUES (new.id, new.cleaned_tweet);
+        END
+    ''',
+    'cleaned_tweets_fts_delete': '''
+        CREATE TRIGGER IF NOT EXISTS cleaned_tweets_fts_delete AFTER DELETE ON cleaned_tweets BEGIN
+            INSERT INTO cleaned_tweets_fts (cleaned_tweets_fts, rowid, cleaned_tweet)
+            VALUES ('delete', old.id, old.cleaned_tweet);
+        END
+    ''',
+    'cleaned_tweets_fts_update': '''
+        CREATE TRIGGER IF NOT EXISTS cleaned_tweets_fts_update AFTER UPDATE OF cleaned_tweet ON cleaned_tweets BEGIN
+            INSERT INTO cleaned_tweets_fts (cleaned_tweets_fts, rowid, cleaned_tweet)
+            VALUES ('delete', old.id, old.cleaned_tweet);
+            INSERT INTO cleaned_tweets_fts (rowid, cleaned_tweet) VALUES (new.id, new.cleaned_tweet);
+        END
+    ''',
+}
+
+# Hash isi tweet, dipakai sebagai kunci unik agar penyimpanan ulang tidak menggandakan baris
+def content_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+# Buka koneksi SQLite dengan PRAGMA yang bisa diatur
+def connect_sqlite(db_path=SQLITE_DB_PATH, pragmas=None):
+    conn = sqlite3.connect(db_path)
+    for name, value in {**SQLITE_PRAGMAS, **(pragmas or {})}.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+# Pastikan tabel cleaned_tweets ada dan punya kolom content_hash yang unik, kolom labels (bitmask LabelIndex),
+# jumlah baris dataset per tweet (occurrences, total dan per label) untuk term_counts,
+# serta tabel FTS5 cleaned_tweets_fts yang disinkronkan lewat trigger untuk endpoint /search
+def ensure_cleaned_tweets_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cleaned_tweets (
+            id INTEGER PRIMARY KEY,
+            original_tweet TEXT,
+            cleaned_tweet TEXT,
+            content_hash TEXT
+        )
+    ''')
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(cleaned_tweets)')]
+    if 'content_hash' not in columns:
+        # Database lama: isi hash untuk baris yang sudah ada lalu buang duplikat hasil run sebelumnya
+        conn.execute('ALTER TABLE cleaned_tweets ADD COLUMN content_hash TEXT')
+        rows = conn.execute('SELECT id, original_tweet FROM cleaned_tweets').fetchall()
+        conn.executemany('UPDATE cleaned_tweets SET content_hash = ? WHERE id = ?',
+                         ((content_hash(tweet or ''), row_id) for row_id, tweet in rows))
+        conn.execute('''
+            DELETE FROM cleaned_tweets
+            WHERE id NOT IN (SELECT MIN(id) FROM cleaned_tweets GROUP BY content_hash)
         ''')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_cleaned_tweets_hash ON cleaned_tweets (content_hash)')
+    if 'labels' not in columns:
+        conn.execute('ALTER TABLE cleaned_tweets ADD COLUMN labels INTEGER')
+    if 'occurrences' not in columns:
+        # Database lama: satu kemunculan per tweet, sesuai term_counts yang sudah ada. Kunci sinkronisasi
+        # dihapus supaya run berikutnya mengisi jumlah kemunculan sebenarnya dari dataset.
+        conn.execute('ALTER TABLE cleaned_tweets ADD COLUMN occurrences INTEGER NOT NULL DEFAULT 1')
+        conn.execute('ALTER TABLE cleaned_tweets ADD COLUMN hs_occurrences INTEGER NOT NULL DEFAULT 0')
+        conn.execute('ALTER TABLE cleaned_tweets ADD COLUMN abusive_occurrences INTEGER NOT NULL DEFAULT 0')
+        rows = conn.execute('SELECT id, labels FROM cleaned_tweets WHERE labels IS NOT NULL').fetchall()
+        conn.executemany('UPDATE cleaned_tweets SET hs_occurrences = ?, abusive_occurrences = ? WHERE id = ?',
+                         (label_occurrences(labels)[1:] + (row_id,) for row_id, labels in rows))
+        ensure_sync_tables(conn)
+        conn.execute("DELETE FROM ingest_sync WHERE name = 'cleaned_tweets'")
+
+    # Index full-text external content: teks disimpan sekali di cleaned_tweets, FTS hanya menyimpan index-nya.
+    # prefix='2 3' mempercepat query prefix pendek (mis. "ba*")
+    fts_exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'cleaned_tweets_fts'").fetchone()
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS cleaned_tweets_fts USING fts5(
+            cleaned_tweet, content='cleaned_tweets', content_rowid='id', prefix='2 3'
+        )
+    ''')
+    for trigger in FTS_TRIGGERS.values():
+        conn.execute(trigger)
+    if not fts_exists:
+        # Database lama: index semua baris yang sudah ada
+        conn.execute("INSERT INTO cleaned_tweets_fts (cleaned_tweets_fts) VALUES ('rebuild')")
+
+    # Frekuensi kata per label untuk /top_terms
+    ensure_term_counts_table(conn)
+    ensure_sync_tables(conn)
+
+# Status sinkronisasi cleaned_tweets disimpan di database itu sendiri, bukan di manifest CSV:
+#   ingest_sync      - kunci (versi kamus + hash semua baris dataset) dari sinkronisasi terakhir yang berhasil
+#   ingest_sync_rows - content_hash yang sudah ditulis selama sinkronisasi yang sedang berjalan; baris
+#                      cleaned_tweets di luar daftar ini dihapus saat sinkronisasi selesai
+def ensure_sync_tables(conn):
+    conn.execute('CREATE TABLE IF NOT EXISTS ingest_sync (name TEXT PRIMARY KEY, value TEXT)')
+    conn.execute('CREATE TABLE IF NOT EXISTS ingest_sync_rows (content_hash TEXT PRIMARY KEY) WITHOUT ROWID')
 
-        for _, row in dataset.iterrows():
-            cursor.execute('INSERT INTO cleaned_tweets (original_tweet, cleaned_tweet) VALUES (?, ?)',
-                           (row['Tweet'], row['cleaned_tweet']))
-        
-        conn.commit()
-        print("Data saved to SQLite successfully")
+# Kunci sinkronisasi untuk isi dataset (tanpa kolom cleaned_tweet) yang dibersihkan dengan versi kamus tertentu.
+# digest bisa diberikan untuk menghitungnya per potongan (ingest streaming).
+def dataset_sync_key(dataset, dictionary_version, digest=None):
+    digest = digest or hashlib.sha1(dictionary_version.encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(dataset.drop(columns='cleaned_tweet', errors='ignore'),
+                                             index=False).to_numpy().tobytes())
+    return digest
+
+# Kunci sinkronisasi terakhir yang berhasil; None jika database baru atau sinkronisasi sebelumnya tidak selesai
+def sqlite_sync_key(db_path=SQLITE_DB_PATH):
+    conn = connect_sqlite(db_path)
+    try:
+        with conn:
+            ensure_cleaned_tweets_table(conn)
+        row = conn.execute("SELECT value FROM ingest_sync WHERE name = 'cleaned_tweets'").fetchone()
+        return row[0] if row is not None else None
+    finally:
+        conn.close()
+
+# Mulai sinkronisasi penuh: kunci lama dihapus dulu, jadi jika proses berhenti di tengah jalan
+# run berikutnya mengulang sinkronisasi
+def begin_sqlite_sync(db_path=SQLITE_DB_PATH):
+    conn = connect_sqlite(db_path)
+    try:
+        with conn:
+            ensure_cleaned_tweets_table(conn)
+            conn.execute("DELETE FROM ingest_sync WHERE name = 'cleaned_tweets'")
+            conn.execute('DELETE FROM ingest_sync_rows')
+    finally:
+        conn.close()
+
+# Selesaikan sinkronisasi: hapus baris yang tidak ada lagi di dataset (FTS lewat trigger, term_counts lewat
+# delta negatif) lalu simpan kuncinya, dalam satu transaksi. Mengembalikan True jika berhasil.
+def finish_sqlite_sync(sync_key, db_path=SQLITE_DB_PATH):
+    conn = None
+    try:
+        conn = connect_sqlite(db_path)
+        with conn:
+            stale = 'content_hash NOT IN (SELECT content_hash FROM ingest_sync_rows)'
+            removed = conn.execute(f'SELECT cleaned_tweet, occurrences, hs_occurrences, abusive_occurrences '
+                                   f'FROM cleaned_tweets WHERE {stale}')
+            apply_term_deltas(conn, add_term_counts({}, removed, -1))
+            deleted = conn.execute(f'DELETE FROM cleaned_tweets WHERE {stale}').rowcount
+            conn.execute('DELETE FROM ingest_sync_rows')
+            conn.execute("INSERT OR REPLACE INTO ingest_sync (name, value) VALUES ('cleaned_tweets', ?)", (sync_key,))
+        if deleted:
+            print(f"Removed {deleted} rows no longer in the dataset from SQLite")
+        return True
     except Exception as e:
         print(f"Error during SQLite operations: {e}")
+        return False
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+# content_hash dari daftar hashes yang sudah dicatat di ingest_sync_rows (sinkronisasi yang sedang berjalan)
+def staged_sync_rows(conn, hashes):
+    staged = set()
+    for i in range(0, len(hashes), 500):
+        chunk = hashes[i:i + 500]
+        staged.update(row[0] for row in conn.execute(
+            f'SELECT content_hash FROM ingest_sync_rows WHERE content_hash IN ({",".join("?" * len(chunk))})', chunk))
+    return staged
+
+# Sinkronkan cleaned_tweets dengan seluruh dataset: baris baru/berubah di-upsert, baris yang hilang dihapus
+def sync_to_sqlite(dataset, sync_key, db_path=SQLITE_DB_PATH):
+    begin_sqlite_sync(db_path)
+    return save_to_sqlite(dataset, db_path, sync=True) and finish_sqlite_sync(sync_key, db_path)
+
+# Fungsi untuk menyimpan data ke dalam SQLite. Mengembalikan True jika berhasil.
+# sync=True: content_hash setiap baris juga dicatat di ingest_sync_rows (bagian dari sinkronisasi penuh)
+def save_to_sqlite(dataset, db_path=SQLITE_DB_PATH, batch_size=SQLITE_BATCH_SIZE, pragmas=None, sync=False):
+    conn = None
+    try:
+        start = time.perf_counter()
+        conn = connect_sqlite(db_path, pragmas)
+        ensure_cleaned_tweets_table(conn)
+
+        # Tweet yang sama muncul lebih dari sekali dengan label berbeda: simpan sekali dengan label kemunculan
+        # terakhir, beserta jumlah barisnya (total dan per label) supaya term_counts tetap per baris dataset
+        processed = len(dataset)
+        has_labels = all(column in dataset.columns for column in LABEL_COLUMNS)
+        occurrences = pd.DataFrame({
+            'Tweet': dataset['Tweet'],
+            'total': 1,
+            'hs': (dataset['HS'] != 0).astype(int) if has_labels else 0,
+            'abusive': (dataset['Abusive'] != 0).astype(int) if has_labels else 0,
+        }).groupby('Tweet', sort=False).sum()
+        dataset = dataset.drop_duplicates(subset='Tweet', keep='last')
+        occurrences = occurrences.loc[dataset['Tweet']]
+
+        # Bitmask label per baris (bit sama dengan LabelIndex) untuk filter label di /search
+        labels = LabelIndex.from_frame(dataset).masks.tolist() if has_labels else itertools.repeat(None)
+        rows = ((tweet, cleaned, content_hash(tweet), label, total, hs, abusive)
+                for tweet, cleaned, label, total, hs, abusive in zip(
+                    dataset['Tweet'], dataset['cleaned_tweet'], labels,
+                    occurrences['total'].tolist(), occurrences['hs'].tolist(), occurrences['abusive'].tolist()))
+        written = 0
+        term_deltas = {}
+        # Satu transaksi, executemany per batch; hanya tweet baru atau yang hasil cleansing, label atau
+        # jumlah kemunculannya berubah yang ditulis (disaring batch_term_deltas).
+        # Index FTS ikut diperbarui oleh trigger dan frekuensi kata lewat delta per batch, dalam transaksi yang sama.
+        # Ingest pertama ke tabel kosong: trigger insert dilepas dan index dibangun sekali di akhir ('rebuild'),
+        # sekitar 3x lebih cepat daripada mengindeks baris satu per satu.
+        bulk_load = conn.execute('SELECT NOT EXISTS (SELECT 1 FROM cleaned_tweets)').fetchone()[0]
+        with conn:
+            if bulk_load:
+                conn.execute('DROP TRIGGER cleaned_tweets_fts_insert')
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                # Tweet yang sudah ditulis potongan sebelumnya di sinkronisasi ini: jumlah kemunculannya ditambahkan
+                staged = staged_sync_rows(conn, [row[2] for row in batch]) if sync and not bulk_load else ()
+                if sync:
+                    conn.executemany('INSERT OR IGNORE INTO ingest_sync_rows (content_hash) VALUES (?)',
+                                     ((row[2],) for row in batch))
+                batch = batch_term_deltas(conn, batch, term_deltas, existing_rows=not bulk_load, accumulate=staged)
+                written += conn.executemany('''
+                    INSERT INTO cleaned_tweets (original_tweet, cleaned_tweet, content_hash, labels,
+                                                occurrences, hs_occurrences, abusive_occurrences)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (content_hash) DO UPDATE SET
+                        cleaned_tweet = excluded.cleaned_tweet,
+                        labels = excluded.labels,
+                        occurrences = excluded.occurrences,
+                        hs_occurrences = excluded.hs_occurrences,
+                        abusive_occurrences = excluded.abusive_occurrences
+                ''', batch).rowcount
+            if bulk_load:
+                conn.execute("INSERT INTO cleaned_tweets_fts (cleaned_tweets_fts) VALUES ('rebuild')")
+                conn.execute(FTS_TRIGGERS['cleaned_tweets_fts_insert'])
+            apply_term_deltas(conn, term_deltas)
+
+        elapsed = time.perf_counter() - start
+        print(f"Data saved to SQLite successfully: {processed} rows processed, {written} inserted/updated "
+              f"in {elapsed:.2f}s ({processed / max(elapsed, 1e-9):.0f} rows/s)")
+        return True
+    except Exception as e:
+        print(f"Error during SQLite operations: {e}")
+        return False
+    finally:
+        if conn is not None:
+            conn.close()
+
+# Generator hasil cleansing per potongan dalam format NDJSON (satu objek JSON per baris)
+def generate_ndjson(chunks, cleaner):
+    for chunk in chunks:
+        chunk = chunk[['Tweet']].copy()
+        chunk['cleaned_tweet'] = cleaner.clean_many(chunk['Tweet'])
+        yield encode_ndjson(chunk, ['Tweet', 'cleaned_tweet'])
+
+# Generator hasil cleansing per potongan dalam format CSV (header dikirim sekali di awal)
+def generate_csv(chunks, cleaner):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['Tweet', 'cleaned_tweet'])
+    for chunk in chunks:
+        writer.writerows(zip(chunk['Tweet'], cleaner.clean_many(chunk['Tweet'])))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+# Teruskan potongan apa adanya sambil menghitung total baris; on_done(total) dipanggil setelah potongan terakhir
+def count_rows(chunks, on_done):
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        yield chunk
+    on_done(total)
 
-# Fungsi untuk menjalankan Flask API
-def start_flask_app(kamusalay, abusive_words):
+# Baca upload CSV per potongan. File upload request sudah ditutup Flask begitu view selesai,
+# jadi isinya disalin dulu ke file sementara yang ditutup setelah potongan terakhir dibaca.
+def read_upload_chunks(file, chunk_size):
+    upload = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+    shutil.copyfileobj(file.stream, upload)
+    upload.seek(0)
+    try:
+        with pd.read_csv(upload, chunksize=chunk_size) as reader:
+            yield from reader
+    finally:
+        upload.close()
+
+# Ambil daftar (id, teks) dari body /clean_batch: array string, atau array objek {"id": ..., "text": ...}
+def parse_batch_items(payload):
+    if not isinstance(payload, list):
+        raise ValueError("Body must be a JSON array of texts or {\"id\", \"text\"} objects")
+    items = []
+    for position, item in enumerate(payload):
+        if isinstance(item, str):
+            items.append((None, item))
+        elif isinstance(item, dict) and isinstance(item.get('text'), str):
+            items.append((item.get('id'), item['text']))
+        else:
+            raise ValueError(f"Item {position} must be a string or an object with a string 'text'")
+    return items
+
+# Cocokkan header X-Admin-Token dengan ADMIN_TOKEN dalam waktu konstan; selalu False jika ADMIN_TOKEN tidak di-set
+def valid_admin_token(token):
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token.encode('utf-8'),
+                                                                           ADMIN_TOKEN.encode('utf-8'))
+
+# Fungsi untuk membuat aplikasi Flask beserta semua endpoint-nya.
+# Jika cleaner tidak diberikan, kamus dimuat di background dan endpoint cleansing menjawab 503 sampai siap.
+# watch_interval > 0 memantau file kamus dan memuat ulang otomatis saat berubah.
+# job_workers: jumlah thread worker antrean job di proses ini (default JOB_WORKERS).
+# profiling: aktifkan hook profiling per request (default PROFILING_ENABLED).
+# start_threads: jalankan thread background (watcher dan follower kamus, worker antrean job) sekarang juga.
+# Di gunicorn dengan preload_app (wsgi.py) nilainya False supaya thread tidak berjalan di master; tiap worker
+# memanggil app.start_background_threads() lewat hook post_worker_init di gunicorn.conf.py.
+def create_app(cleaner=None, cache=None, watch_interval=None, job_workers=None, profiling=None, start_threads=True):
     app = Flask(__name__)
+    if cache is None:
+        cache = CleanResultCache(SQLITE_DB_PATH, max_entries=CACHE_MAX_ENTRIES,
+                                 max_text_length=CACHE_MAX_TEXT_LENGTH,
+                                 max_persistent_entries=CACHE_MAX_PERSISTENT_ENTRIES)
+    if watch_interval is None:
+        watch_interval = DICTIONARY_WATCH_INTERVAL
+
+    metrics = Metrics() if METRICS_ENABLED else None
+    # Skema cleaned_tweets (beserta FTS dan term_counts) dibuat di awal, supaya /search dan /top_terms
+    # menjawab hasil kosong pada database yang belum diisi main() (--serve-only, wsgi.py)
+    conn = connect_sqlite(SQLITE_DB_PATH)
+    try:
+        with conn:
+            ensure_cleaned_tweets_table(conn)
+    finally:
+        conn.close()
+    search = TweetSearch(SQLITE_DB_PATH)
+    terms = TermIndex(SQLITE_DB_PATH)
+    jobs = create_job_queue()
+    if job_workers is None:
+        job_workers = JOB_WORKERS
+    profiler = RequestProfiler(PROFILE_DIR, min_interval=PROFILE_MIN_INTERVAL)
+    if profiling is None:
+        profiling = PROFILING_ENABLED
+    if profiling and not ADMIN_TOKEN:
+        raise RuntimeError("PROFILING_ENABLED=1 requires ADMIN_TOKEN to be set")
+
+    # Cleaner yang sedang aktif; None selama kamus belum siap
+    state = {"cleaner": None}
+
+    # Pasang cleaner baru: dipanaskan dulu, lalu diganti dalam satu assignment (atomik).
+    # Setiap endpoint membaca state["cleaner"] sekali per request, jadi request yang sedang berjalan
+    # menyelesaikan pekerjaannya dengan cleaner lama.
+    def warm_up(cleaner):
+        cleaner.clean('warm up')  # Sentuh semua struktur sekali sebelum dinyatakan siap
+        reloader.set_current(cleaner)
+        state["cleaner"] = InstrumentedCleaner(cleaner, metrics) if metrics is not None else cleaner
+
+    reloader = DictionaryReloader(KAMUSALAY_PATH, ABUSIVE_PATH, CLEANER_ARTIFACT_PATH, warm_up, SQLITE_DB_PATH)
+    if cleaner is not None:
+        warm_up(cleaner)
+    else:
+        reloader.reload()
+
+    # Thread dibuat sekali per process (aman dipanggil berulang), jadi job yang masih queued setelah restart
+    # langsung diproses lagi tanpa menunggu request pertama
+    def start_background_threads():
+        reloader.ensure_watching(watch_interval)
+        reloader.ensure_following(DICTIONARY_POLL_INTERVAL)
+        jobs.ensure_workers(job_workers, lambda: state["cleaner"])
+
+    app.start_background_threads = start_background_threads
+    if start_threads:
+        start_background_threads()
+
+    @app.before_request
+    def require_dictionaries():
+        # Cadangan untuk server WSGI lain yang mem-fork worker tanpa hook seperti post_worker_init
+        start_background_threads()
+        if state["cleaner"] is None and request.endpoint in ('clean_text', 'clean_batch', 'upload_csv'):
+            return jsonify({"error": "Dictionaries are still loading"}), 503
+
+    @app.before_request
+    def require_admin_token():
+        if not request.path.startswith('/admin/'):
+            return
+        if not ADMIN_TOKEN:
+            return jsonify({"error": "Admin endpoints are disabled, set ADMIN_TOKEN to enable them"}), 403
+        if not valid_admin_token(request.headers.get('X-Admin-Token')):
+            return jsonify({"error": "Invalid admin token"}), 403
 
-    with open('./docs/swagger.yml', 'r') as file:
+    # Cleaner untuk request ini; pada request yang diprofil, waktu per tahap juga dicatat ke StageTimer-nya
+    def request_cleaner():
+        cleaner = state["cleaner"]
+        if 'profile_stages' not in g:
+            return cleaner
+        base = cleaner.cleaner if isinstance(cleaner, InstrumentedCleaner) else cleaner
+        return InstrumentedCleaner(base, g.profile_stages)
+
+    if profiling:
+        @app.before_request
+        def start_profile():
+            if request.endpoint not in TIMED_ENDPOINTS or not (
+                    request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'):
+                return
+            if not valid_admin_token(request.headers.get('X-Admin-Token')):
+                return jsonify({"error": "Invalid admin token"}), 403
+            profile = profiler.start()
+            if profile is None:
+                g.profile_skipped = True
+                return
+            g.profile = profile
+            g.profile_id = profiler.new_id()
+            g.profile_start = time.perf_counter()
+            g.profile_stages = StageTimer(metrics.record_stages if metrics is not None else None)
+
+        # Id laporan dikirim di header; respons biasa juga membawa waktu per tahap di Server-Timing.
+        # Respons streaming membersihkan data saat body dikirim, jadi profilnya baru ditutup setelah potongan terakhir.
+        @app.after_request
+        def profile_headers(response):
+            if 'profile_skipped' in g:
+                response.headers['X-Profile'] = 'rate-limited'
+            elif 'profile' in g:
+                response.headers['X-Profile-Id'] = g.profile_id
+                if response.is_streamed:
+                    args = (g.pop('profile'), g.profile_id, request.endpoint, g.profile_start, g.profile_stages)
+                    response.call_on_close(lambda: finish_profile(*args))
+                else:
+                    response.headers['Server-Timing'] = ', '.join(
+                        f'{stage};dur={seconds * 1000:.3f}'
+                        for stage, seconds in zip(CLEAN_STAGES, g.profile_stages.seconds))
+            return response
+
+        # Respons biasa (dan request yang gagal) selesai diprofil saat request context ditutup
+        @app.teardown_request
+        def finish_request_profile(exception):
+            if 'profile' in g:
+                finish_profile(g.pop('profile'), g.profile_id, request.endpoint, g.profile_start, g.profile_stages)
+
+        def finish_profile(profile, profile_id, endpoint, start, stages):
+            profiler.finish(profile, profile_id, endpoint, time.perf_counter() - start, stages)
+
+    # Kompres respons besar jika klien mengirim Accept-Encoding gzip atau deflate.
+    # File dari send_file (direct_passthrough) dikirim apa adanya.
+    @app.after_request
+    def compress_response(response):
+        encoding = request.accept_encodings.best_match(list(COMPRESSION_WBITS))
+        if (encoding is None or response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        if response.is_streamed:
+            response.response = compress_stream(response.iter_encoded(), encoding, COMPRESSION_LEVEL)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < COMPRESSION_MIN_BYTES:
+                return response
+            response.set_data(compress(data, encoding, COMPRESSION_LEVEL))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    if metrics is not None:
+        @app.before_request
+        def start_timer():
+            g.request_start = time.perf_counter()
+
+        # Respons streaming baru membersihkan data saat body dikirim, jadi latensinya dicatat setelah
+        # potongan terakhir terkirim (sama seperti profile_headers), bukan saat after_request
+        @app.after_request
+        def record_latency(response):
+            if request.endpoint in TIMED_ENDPOINTS and 'request_start' in g:
+                path, start = request.path, g.request_start
+                if response.is_streamed:
+                    response.call_on_close(lambda: metrics.observe_request(path, time.perf_counter() - start))
+                else:
+                    metrics.observe_request(path, time.perf_counter() - start)
+            return response
+
+        metrics.gauge('cache_entries', 'Entries in the in-process /clean_text LRU cache',
+                      lambda: cache.stats()["entries"])
+        metrics.gauge('cache_persistent_entries', 'Entries in the persistent SQLite clean_cache table',
+                      lambda: cache.stats().get("persistent_entries", 0))
+        metrics.gauge('cache_hits_total', 'In-process cache hits', lambda: cache.hits, 'counter')
+        metrics.gauge('cache_persistent_hits_total', 'Persistent cache hits', lambda: cache.persistent_hits, 'counter')
+        metrics.gauge('cache_misses_total', 'Cache misses', lambda: cache.misses, 'counter')
+        metrics.gauge('cache_evictions_total', 'In-process cache evictions', lambda: cache.evictions, 'counter')
+        metrics.gauge('dictionary_rules', 'Alay + abusive rules in the active dictionary',
+                      lambda: state["cleaner"].rule_count if state["cleaner"] is not None else 0)
+        metrics.gauge('dictionary_builds_total', 'Dictionary builds (startup load and hot reloads)',
+                      lambda: reloader.status["builds"], 'counter')
+        metrics.gauge('dictionary_build_seconds', 'Duration of the last dictionary build',
+                      lambda: reloader.status["build_seconds"] or 0)
+        metrics.gauge('jobs_queued', 'Async CSV jobs waiting for a worker', lambda: jobs.counts().get('queued', 0))
+        metrics.gauge('jobs_running', 'Async CSV jobs being cleaned', lambda: jobs.counts().get('running', 0))
+
+        @app.route('/metrics', methods=['GET'])
+        def metrics_route():
+            return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    with open(os.path.join(CURRENT_DIR, 'docs/swagger.yml'), 'r') as file:
         swagger_template = yaml.safe_load(file)
     swagger = Swagger(app, template=swagger_template)
 
@@ -99,47 +626,420 @@ def start_flask_app(kamusalay, abusive_words):
     def clean_text():
         try:
             text = request.form.get('text', '')
-            cleaned_text = cleansing_text(text, kamusalay, abusive_words)
+            cleaned_text = cache.clean(text, request_cleaner())
             return jsonify({"cleaned_text": cleaned_text}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    @app.route('/clean_batch', methods=['POST'])
+    def clean_batch():
+        try:
+            if request.content_length is not None and request.content_length > BATCH_MAX_BYTES:
+                return jsonify({"error": f"Payload exceeds {BATCH_MAX_BYTES} bytes"}), 413
+            # Body dibaca sendiri paling banyak BATCH_MAX_BYTES + 1 byte, supaya body chunked (tanpa
+            # Content-Length) juga dibatasi sebelum seluruhnya masuk memori
+            body = request.stream.read(BATCH_MAX_BYTES + 1)
+            if len(body) > BATCH_MAX_BYTES:
+                return jsonify({"error": f"Payload exceeds {BATCH_MAX_BYTES} bytes"}), 413
+            try:
+                payload = json.loads(body) if request.is_json else None
+            except ValueError:
+                payload = None
+            try:
+                items = parse_batch_items(payload)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            if len(items) > BATCH_MAX_SIZE:
+                return jsonify({"error": f"Batch exceeds {BATCH_MAX_SIZE} texts"}), 413
+
+            # Teks yang sama dalam satu batch (mis. retweet) cukup dibersihkan sekali
+            unique_texts = list(dict.fromkeys(text for _, text in items))
+            cleaned = dict(zip(unique_texts, request_cleaner().clean_many(unique_texts)))
+            results = []
+            for item_id, text in items:
+                result = {"cleaned_text": cleaned[text]}
+                if item_id is not None:
+                    result = {"id": item_id, **result}
+                results.append(result)
+            return jsonify({"results": results}), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
     @app.route('/upload_csv', methods=['POST'])
     def upload_csv():
         try:
             file = request.files['file']
+
+            # Mode async untuk file besar: upload disimpan sebagai job dan langsung dijawab 202 + id job
+            if request.args.get('async') in ('1', 'true'):
+                return submit_job(file)
+
+            # Mode streaming: baca per potongan dan kirim hasilnya bertahap, memori tetap terbatas
+            mimetype = request.accept_mimetypes.best_match(['application/json'] + STREAM_MIMETYPES)
+            if mimetype in STREAM_MIMETYPES:
+                chunks = read_upload_chunks(file, UPLOAD_CHUNK_SIZE)
+                first_chunk = next(chunks, None)
+                if first_chunk is None or 'Tweet' not in first_chunk.columns:
+                    chunks.close()
+                    return jsonify({"error": "No 'tweet' column found in the file"}), 400
+                generate = generate_ndjson if mimetype == 'application/x-ndjson' else generate_csv
+                chunks = itertools.chain([first_chunk], chunks)
+                if metrics is not None:
+                    chunks = count_rows(chunks, metrics.observe_upload_rows)
+                body = generate(chunks, request_cleaner())
+                return Response(stream_with_context(body), mimetype=mimetype)
+
             df = pd.read_csv(file)
             if 'Tweet' not in df.columns:
                 return jsonify({"error": "No 'tweet' column found in the file"}), 400
 
-            df['cleaned_tweet'] = df['Tweet'].apply(lambda x: cleansing_text(x, kamusalay, abusive_words))
-            return jsonify(df[['Tweet', 'cleaned_tweet']].to_dict(orient="records")), 200
+            fmt = request.args.get('format', 'records')
+            if fmt not in RESPONSE_FORMATS:
+                return jsonify({"error": f"format must be one of {', '.join(RESPONSE_FORMATS)}"}), 400
+
+            df['cleaned_tweet'] = request_cleaner().clean_many(df['Tweet'])
+            if metrics is not None:
+                metrics.observe_upload_rows(len(df))
+            # Di-encode langsung dari kolom DataFrame (format=records seperti sebelumnya, atau format=columns)
+            return Response(encode_frame(df, ['Tweet', 'cleaned_tweet'], fmt), mimetype='application/json'), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    def submit_job(file):
+        # Cek header dulu supaya file tanpa kolom Tweet langsung ditolak, bukan gagal belakangan di worker
+        if 'Tweet' not in pd.read_csv(file.stream, nrows=0).columns:
+            return jsonify({"error": "No 'tweet' column found in the file"}), 400
+        file.stream.seek(0)
+        try:
+            job_id = jobs.submit(file.stream)
+        except QueueFull as e:
+            response = jsonify({"error": str(e)})
+            response.headers['Retry-After'] = str(JOB_RETRY_AFTER)
+            return response, 429
+        response = jsonify({"job_id": job_id, "status": "queued", "status_url": f'/jobs/{job_id}'})
+        response.headers['Location'] = f'/jobs/{job_id}'
+        return response, 202
+
+    # Status job async: progres (0-1, perkiraan dari posisi baca file) dan jumlah baris yang sudah dibersihkan
+    @app.route('/jobs/<job_id>', methods=['GET'])
+    def job_status(job_id):
+        try:
+            job = jobs.get(job_id)
+            if job is None:
+                return jsonify({"error": "Job not found"}), 404
+            result = {key: job[key] for key in ('status', 'progress', 'processed_rows', 'created_at',
+                                                'started_at', 'finished_at', 'error')}
+            result = {"job_id": job_id, **result}
+            if job["status"] == 'done':
+                result["result_url"] = f'/jobs/{job_id}/result'
+            return jsonify(result), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    # Unduh hasil job (CSV Tweet, cleaned_tweet); 409 selama job belum selesai
+    @app.route('/jobs/<job_id>/result', methods=['GET'])
+    def job_result(job_id):
+        try:
+            job = jobs.get(job_id)
+            if job is None:
+                return jsonify({"error": "Job not found"}), 404
+            if job["status"] != 'done':
+                return jsonify({"error": f"Job is {job['status']}", "status": job["status"]}), 409
+            return send_file(job["result_path"], mimetype='text/csv', as_attachment=True,
+                             download_name=f'cleaned_{job_id}.csv')
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    # Pencarian full-text atas tweet yang sudah dibersihkan (tabel cleaned_tweets di tweets.db)
+    @app.route('/search', methods=['GET'])
+    def search_tweets():
+        try:
+            try:
+                results, next_after = search.search(
+                    request.args.get('q', ''),
+                    mode=request.args.get('mode', 'term'),
+                    labels=request.args.getlist('label'),
+                    exclude=request.args.getlist('exclude'),
+                    after=request.args.get('after', 0, type=int),
+                    limit=request.args.get('limit', SEARCH_DEFAULT_LIMIT, type=int))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            return jsonify({"results": results, "next_after": next_after}), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    # Kata paling sering di tweet yang sudah dibersihkan, dari tabel term_counts yang diperbarui saat ingest
+    @app.route('/top_terms', methods=['GET'])
+    def top_terms():
+        try:
+            try:
+                results = terms.top_terms(k=request.args.get('k', TOP_TERMS_DEFAULT_K, type=int),
+                                          label=request.args.get('label', 'all'))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            return jsonify({"terms": results}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    @app.route('/cache_stats', methods=['GET'])
+    def cache_stats():
+        return jsonify(cache.stats()), 200
+
+    # Bangun ulang kamus dari new_kamusalay.csv dan abusive.csv tanpa restart.
+    # Default langsung menjawab 202 selagi build berjalan di background; ?wait=1 menunggu sampai selesai di
+    # proses ini. Proses lain ikut reload dalam DICTIONARY_POLL_INTERVAL detik.
+    @app.route('/admin/reload_dictionaries', methods=['POST'])
+    def reload_dictionaries():
+        wait = request.args.get('wait') in ('1', 'true')
+        status = reloader.request_reload(wait=wait)
+        if wait:
+            return jsonify(status), 500 if status["state"] == "failed" else 200
+        return jsonify(status), 202
+
+    # Laporan profiling yang tersimpan: waktu per fungsi (self dan kumulatif) dan per tahap cleansing.
+    # Hanya tersedia jika profiling aktif (yang berarti ADMIN_TOKEN juga di-set).
+    @app.route('/admin/profiles/<profile_id>', methods=['GET'])
+    def profile_report(profile_id):
+        if not profiling:
+            return jsonify({"error": "Profiling is disabled"}), 404
+        report = profiler.load(profile_id)
+        if report is None:
+            return jsonify({"error": "Profile not found"}), 404
+        return jsonify(report), 200
+
+    @app.route('/admin/dictionaries', methods=['GET'])
+    def dictionary_status():
+        return jsonify(reloader.snapshot()), 200
+
     @app.route('/test', methods=['GET'])
     def test_route():
         return "Server is running!"
 
-    app.run(debug=True)
+    # Readiness: OK hanya setelah kamus dimuat dan cleaner sudah dipanaskan
+    @app.route('/ready', methods=['GET'])
+    def ready_route():
+        cleaner = state["cleaner"]
+        if cleaner is None:
+            return jsonify({"status": "loading"}), 503
+        return jsonify({"status": "ready", "dictionary_version": cleaner.version}), 200
+
+    return app
+
+def create_job_queue():
+    return JobQueue(SQLITE_DB_PATH, JOB_STORAGE_DIR, max_pending=JOB_MAX_PENDING, max_running=JOB_MAX_RUNNING,
+                    chunk_size=UPLOAD_CHUNK_SIZE, retention_seconds=JOB_RETENTION_HOURS * 3600)
+
+# Worker antrean job sebagai proses terpisah dari server web (python app.py --job-worker N).
+# Memakai database yang sama, jadi bisa dijalankan berdampingan dengan worker thread di server.
+def run_job_workers(count=1):
+    cleaner = load_text_cleaner(KAMUSALAY_PATH, ABUSIVE_PATH, CLEANER_ARTIFACT_PATH)
+    jobs = create_job_queue()
+    print(f"Job worker started with {count} thread(s)")
+    threads = [threading.Thread(target=jobs.work, args=(lambda: cleaner,)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+# Fungsi untuk menjalankan Flask API dengan server bawaan Flask (untuk development).
+# Reloader dimatikan agar main() tidak dijalankan dua kali; untuk produksi pakai gunicorn + wsgi.py.
+def start_flask_app(cleaner=None, cache=None, debug=False, watch_interval=None):
+    app = create_app(cleaner, cache, watch_interval)
+    app.run(debug=debug, use_reloader=False, threaded=True)
+
+# Hash isi setiap baris dataset (tweet + label), dihitung tervektorisasi oleh pandas
+def row_hashes(dataset):
+    return pd.util.hash_pandas_object(dataset, index=False).tolist()
+
+# Baca manifest run sebelumnya; None jika tidak ada, rusak, atau file output sudah diubah di luar pipeline
+def load_manifest(manifest_path, output_path):
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        stat = os.stat(output_path)
+        if (manifest.get("format") != MANIFEST_FORMAT or manifest["output_size"] != stat.st_size
+                or manifest["output_mtime_ns"] != stat.st_mtime_ns):
+            return None
+        return manifest
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_manifest(manifest_path, output_path, dictionary_version, hashes):
+    stat = os.stat(output_path)
+    manifest = {"format": MANIFEST_FORMAT, "dictionary_version": dictionary_version,
+                "output_size": stat.st_size, "output_mtime_ns": stat.st_mtime_ns, "row_hashes": hashes}
+    tmp_path = f'{manifest_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+# Cleansing inkremental: hanya baris yang baru/berubah yang dibersihkan, sisanya diambil dari output lama.
+# Semua baris dibersihkan ulang jika versi kamus berubah, manifest tidak ada, atau full=True.
+# Mengembalikan mask baris yang dibersihkan ulang.
+def clean_incremental(dataset, cleaner, output_path=CLEANED_DATASET_PATH, manifest_path=MANIFEST_PATH,
+                      workers=1, full=False):
+    hashes = row_hashes(dataset)
+    manifest = None if full else load_manifest(manifest_path, output_path)
+    if manifest is not None and manifest["dictionary_version"] != cleaner.version:
+        print("Dictionary changed, re-cleaning the full dataset")
+        manifest = None
+
+    previous = {}
+    if manifest is not None:
+        old_cleaned = pd.read_csv(output_path, usecols=['cleaned_tweet'], dtype=str, keep_default_na=False)
+        previous = dict(zip(manifest["row_hashes"], old_cleaned['cleaned_tweet']))
+
+    changed = pd.Series([h not in previous for h in hashes], index=dataset.index)
+    cleaned = pd.Series([previous.get(h) for h in hashes], index=dataset.index, dtype=object)
+    if changed.any():
+        cleaned[changed] = cleaner.clean_many(dataset.loc[changed, 'Tweet'], workers=workers)
+    dataset['cleaned_tweet'] = cleaned
+
+    old_hashes = manifest["row_hashes"] if manifest is not None else None
+    if old_hashes == hashes:
+        print("Cleaned dataset is up to date")
+        return changed
+    if old_hashes is not None and hashes[:len(old_hashes)] == old_hashes:
+        # Hanya ada baris baru di akhir: cukup tambahkan ke output lama
+        dataset.iloc[len(old_hashes):].to_csv(output_path, mode='a', header=False, index=False)
+    else:
+        dataset.to_csv(output_path, index=False)
+    save_manifest(manifest_path, output_path, cleaner.version, hashes)
+    print(f"Cleaned dataset saved successfully ({int(changed.sum())} of {len(dataset)} rows cleaned)")
+    return changed
+
+# Ingest streaming untuk dump mentah yang besar: file dibaca, didecode, dibersihkan dan ditulis per potongan
+# (CSV hasil, index label, output kolumnar, SQLite), jadi memori puncak tidak ikut membesar dengan ukuran input.
+# Seluruh file selalu dibersihkan (manifest inkremental tidak dipakai dan dihapus), tetapi SQLite tetap
+# hanya menulis baris yang baru atau berubah, dan baris yang tidak ada lagi di file dihapus di akhir.
+# Output lama baru diganti setelah semua potongan berhasil.
+def ingest_streaming(cleaner, dataset_path=DATASET_PATH, output_path=CLEANED_DATASET_PATH,
+                     manifest_path=MANIFEST_PATH, db_path=SQLITE_DB_PATH, chunk_size=STREAM_CHUNK_SIZE,
+                     workers=1, columnar=None):
+    start = time.perf_counter()
+    tmp_path = f'{output_path}.{os.getpid()}.tmp'
+    writers = [LabelIndexWriter(LabelIndex.path_for(output_path)),
+               TokenizedCorpusWriter(TokenizedCorpus.path_for(output_path))]
+    if columnar is not None:
+        try:
+            writers.append(ColumnarWriter(columnar_path(output_path, columnar), columnar))
+        except ImportError as e:
+            print(f"Skipping columnar output, pyarrow is not installed: {e}")
+    rows = 0
+    sync_digest = None
+    synced = True
+    begin_sqlite_sync(db_path)
+    # Satu pool worker process (kamus dikirim sekali per worker) dipakai untuk semua potongan
+    executor = cleaner.process_pool(workers)
+    try:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+            for chunk in read_decoded_csv_chunks(dataset_path, chunk_size):
+                sync_digest = dataset_sync_key(chunk, cleaner.version, sync_digest)
+                chunk['cleaned_tweet'] = cleaner.clean_many(chunk['Tweet'], workers=workers, executor=executor)
+                chunk.to_csv(out, header=rows == 0, index=False)
+                synced = save_to_sqlite(chunk, db_path, sync=True) and synced
+                for writer in writers:
+                    writer.write(chunk)
+                rows += len(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        for writer in writers:
+            writer.abort()
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    os.replace(tmp_path, output_path)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    # Ditutup setelah CSV diganti, supaya index label dan korpus token tidak lebih lama dari CSV (is_fresh)
+    for writer in writers:
+        writer.close()
+    if synced and sync_digest is not None:
+        finish_sqlite_sync(sync_digest.hexdigest(), db_path)
+    print(f"Streamed {rows} rows in {time.perf_counter() - start:.2f}s")
+    return rows
 
 # Fungsi utama untuk mengatur alur kerja aplikasi
-def main():
-    dataset, abusive_words, kamusalay = load_and_clean_data()
+# stream=True memakai ingest_streaming (memori terbatas untuk dump besar) menggantikan alur inkremental.
+# columnar: 'parquet' atau 'feather' untuk juga menulis output kolumnar di samping CSV (butuh pyarrow)
+def main(workers=1, full=False, debug=False, watch_interval=None, columnar=None, stream=False,
+         chunk_size=STREAM_CHUNK_SIZE):
+    if stream:
+        cleaner = load_text_cleaner(KAMUSALAY_PATH, ABUSIVE_PATH, CLEANER_ARTIFACT_PATH)
+        ingest_streaming(cleaner, chunk_size=chunk_size, workers=workers, columnar=columnar)
+        start_flask_app(cleaner, debug=debug, watch_interval=watch_interval)
+        return
+
+    # Regex dan kamus sudah dikompilasi sekali di TextCleaner, lalu dipakai untuk semua tweet
+    dataset, cleaner = load_and_clean_data()
     if dataset is None:
         print("Failed to load the data.")
         return
 
-    # Cleansing data
-    dataset['cleaned_tweet'] = dataset['Tweet'].apply(lambda x: cleansing_text(x, kamusalay, abusive_words))
-    dataset.to_csv('data/cleaned_dataset_final.csv', index=False)
-    print("Cleaned dataset saved successfully")
+    # Kunci sinkronisasi SQLite dihitung sebelum kolom cleaned_tweet ditambahkan
+    sync_key = dataset_sync_key(dataset, cleaner.version).hexdigest()
+
+    # Cleansing data (inkremental: hanya baris baru atau berubah yang dibersihkan)
+    changed = clean_incremental(dataset, cleaner, workers=workers, full=full)
+
+    # Save to SQLite: dilewati jika database sudah sinkron dengan dataset dan kamus ini (status disimpan
+    # di database, jadi tweets.db yang dihapus, baris yang dihapus dari dataset, atau penyimpanan yang gagal
+    # tetap ditangani pada run berikutnya). Baris yang tidak berubah tidak ditulis ulang oleh upsert.
+    if full or sqlite_sync_key() != sync_key:
+        sync_to_sqlite(dataset, sync_key)
+    else:
+        print("SQLite database is up to date")
+
+    # Index label bit-packed di samping CSV (data/cleaned_dataset_final.labels.npy) untuk query label cepat
+    if changed.any() or not LabelIndex.is_fresh(CLEANED_DATASET_PATH):
+        LabelIndex.from_frame(dataset).save(LabelIndex.path_for(CLEANED_DATASET_PATH))
+
+    # Korpus token id (CSR) + vocabulary + label sejajar untuk analisis/model hilir tanpa tokenisasi ulang
+    if changed.any() or not TokenizedCorpus.is_fresh(CLEANED_DATASET_PATH):
+        writer = TokenizedCorpusWriter(TokenizedCorpus.path_for(CLEANED_DATASET_PATH))
+        writer.write(dataset)
+        writer.close()
 
-    # Save to SQLite
-    save_to_sqlite(dataset)
+    # Output kolumnar dengan dtype ringkas; ditulis ulang utuh jika ada baris yang berubah atau CSV-nya
+    # ditulis ulang (mis. baris hanya dihapus atau diurutkan ulang sehingga changed seluruhnya False)
+    if columnar is not None:
+        path = columnar_path(CLEANED_DATASET_PATH, columnar)
+        if changed.any() or not columnar_is_fresh(CLEANED_DATASET_PATH, columnar):
+            try:
+                save_columnar(dataset, path, columnar)
+                print(f"Columnar dataset saved to {path}")
+            except ImportError as e:
+                print(f"Skipping columnar output, pyarrow is not installed: {e}")
 
     # Start Flask app
-    start_flask_app(kamusalay, abusive_words)
+    start_flask_app(cleaner, debug=debug, watch_interval=watch_interval)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Jumlah worker process untuk cleansing dataset (0 = semua core)')
+    parser.add_argument('--full', action='store_true',
+                        help='Bersihkan ulang seluruh dataset, abaikan manifest run sebelumnya')
+    parser.add_argument('--serve-only', action='store_true',
+                        help='Jalankan API saja tanpa pipeline batch (cleansing dataset dan SQLite)')
+    parser.add_argument('--debug', action='store_true', help='Aktifkan debugger Flask')
+    parser.add_argument('--watch-dictionaries', type=float, default=None, metavar='SECONDS',
+                        help='Pantau file kamus setiap SECONDS detik dan muat ulang otomatis saat berubah')
+    parser.add_argument('--columnar', choices=sorted(COLUMNAR_FORMATS),
+                        help='Tulis juga data/cleaned_dataset_final dalam format kolumnar (parquet/feather)')
+    parser.add_argument('--job-worker', type=int, default=None, metavar='THREADS',
+                        help='Jalankan worker antrean job async saja (tanpa server web) dengan THREADS thread')
+    parser.add_argument('--stream', action='store_true',
+                        help='Ingest dataset per potongan dengan memori terbatas (untuk dump mentah yang besar)')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE,
+                        help='Jumlah baris per potongan untuk --stream')
+    args = parser.parse_args()
+    if args.job_worker is not None:
+        run_job_workers(args.job_worker)
+    elif args.serve_only:
+        start_flask_app(debug=args.debug, watch_interval=args.watch_dictionaries)
+    else:
+        main(workers=args.workers, full=args.full, debug=args.debug, watch_interval=args.watch_dictionaries,
+             columnar=args.columnar, stream=args.stream, chunk_size=args.chunk_size)
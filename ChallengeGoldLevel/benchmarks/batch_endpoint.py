@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app as app_module
+from result_cache import CleanResultCache
+from text_cleaner import read_decoded_csv, load_text_cleaner
+
+
+# Bandingkan throughput /clean_text (satu teks per request) dengan /clean_batch lewat Flask test client
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--texts', type=int, default=2000, help='Jumlah tweet dari data/dataset.csv yang dikirim')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    dataset = read_decoded_csv(app_module.DATASET_PATH)
+    texts = dataset['Tweet'].tolist()[:args.texts]
+    cleaner = load_text_cleaner(app_module.KAMUSALAY_PATH, app_module.ABUSIVE_PATH, app_module.CLEANER_ARTIFACT_PATH)
+    # Cache dimatikan (kapasitas 0, tanpa SQLite) supaya yang diukur adalah jalur cleansing-nya. Database,
+    # folder job dan status reload kamus app ada di folder sementara, bukan tweets.db dan jobs/ working tree.
+    tmp_dir = tempfile.TemporaryDirectory()
+    app_module.SQLITE_DB_PATH = os.path.join(tmp_dir.name, 'app.db')
+    app_module.JOB_STORAGE_DIR = os.path.join(tmp_dir.name, 'jobs')
+    app_module.DICTIONARY_POLL_INTERVAL = 0
+    client = app_module.create_app(cleaner, CleanResultCache(None, max_entries=0), job_workers=0).test_client()
+
+    print(f"{len(texts)} texts from data/dataset.csv")
+    print(f"{'endpoint':<24} {'requests':>8} {'seconds':>8} {'req/s':>9} {'texts/s':>9}")
+
+    start = time.perf_counter()
+    for text in texts:
+        client.post('/clean_text', data={'text': text})
+    elapsed = time.perf_counter() - start
+    print(f"{'/clean_text':<24} {len(texts):>8} {elapsed:>8.2f} {len(texts) / elapsed:>9.0f} {len(texts) / elapsed:>9.0f}")
+
+    for batch_size in args.batch_sizes:
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        start = time.perf_counter()
+        for batch in batches:
+            client.post('/clean_batch', json=[{"id": str(i), "text": text} for i, text in enumerate(batch)])
+        elapsed = time.perf_counter() - start
+        label = f"/clean_batch (n={batch_size})"
+        print(f"{label:<24} {len(batches):>8} {elapsed:>8.2f} {len(batches) / elapsed:>9.0f} {len(texts) / elapsed:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
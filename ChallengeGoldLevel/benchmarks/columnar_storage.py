@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import LABEL_COLUMNS
+from columnar import COLUMNAR_FORMATS, save_columnar, read_columnar
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+# Bandingkan CSV hasil cleansing dengan output kolumnar: ukuran file, waktu muat, dan memori DataFrame,
+# untuk seluruh kolom dan untuk kolom label saja
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(DATA_DIR, 'cleaned_dataset_final.csv'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    dataset = pd.read_csv(args.csv)
+    print(f"{len(dataset)} rows from {args.csv}")
+    print(f"{'format':<10} {'columns':<8} {'file MB':>8} {'load ms':>8} {'memory MB':>10}")
+
+    def report(name, path, columns, load):
+        seconds, frame = best_of(args.repeat, load)
+        memory = frame.memory_usage(deep=True).sum() / 1e6
+        print(f"{name:<10} {columns:<8} {os.path.getsize(path) / 1e6:>8.2f} {seconds * 1000:>8.1f} {memory:>10.2f}")
+
+    report('csv', args.csv, 'all', lambda: pd.read_csv(args.csv))
+    report('csv', args.csv, 'labels', lambda: pd.read_csv(args.csv, usecols=LABEL_COLUMNS))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt, extension in COLUMNAR_FORMATS.items():
+            path = os.path.join(tmp_dir, 'cleaned' + extension)
+            save_columnar(dataset, path, fmt)
+            report(fmt, path, 'all', lambda: read_columnar(path))
+            report(fmt, path, 'labels', lambda: read_columnar(path, columns=LABEL_COLUMNS))
+
+
+if __name__ == '__main__':
+    main()
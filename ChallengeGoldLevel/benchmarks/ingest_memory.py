@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCHMARK_DIR)
+DATA_DIR = os.path.join(APP_DIR, 'data')
+
+
+# Buat dump mentah sebesar `copies` kali data/dataset.csv (byte mentah, header sekali)
+def make_dump(path, copies):
+    with open(os.path.join(DATA_DIR, 'dataset.csv'), 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    with open(path, 'wb') as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+
+
+# Dijalankan di proses anak supaya ru_maxrss hanya mencakup satu mode ingest
+def run_ingest(mode, dump_path, work_dir, chunk_size, columnar):
+    sys.path.insert(0, APP_DIR)
+    import app
+    from label_index import LabelIndex
+    from text_cleaner import load_text_cleaner
+
+    cleaner = load_text_cleaner(app.KAMUSALAY_PATH, app.ABUSIVE_PATH, app.CLEANER_ARTIFACT_PATH)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    output_path = os.path.join(work_dir, 'cleaned.csv')
+    manifest_path = os.path.join(work_dir, 'cleaned.manifest.json')
+    db_path = os.path.join(work_dir, 'tweets.db')
+    start = time.perf_counter()
+    if mode == 'stream':
+        app.ingest_streaming(cleaner, dataset_path=dump_path, output_path=output_path, manifest_path=manifest_path,
+                             db_path=db_path, chunk_size=chunk_size, columnar=columnar)
+    else:
+        # Alur main() tanpa --stream: seluruh file didecode dan dibaca ke satu DataFrame
+        dataset = app.read_decoded_csv(dump_path)
+        app.clean_incremental(dataset, cleaner, output_path=output_path, manifest_path=manifest_path, full=True)
+        app.save_to_sqlite(dataset, db_path)
+        LabelIndex.from_frame(dataset).save(LabelIndex.path_for(output_path))
+        if columnar is not None:
+            app.save_columnar(dataset, app.columnar_path(output_path, columnar), columnar)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{baseline} {peak} {elapsed}")
+
+
+# Bandingkan RSS puncak main() biasa (semua di memori) dan --stream untuk dump yang makin besar
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 4, 16],
+                        help='Ukuran dump sebagai kelipatan data/dataset.csv')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--columnar', choices=['parquet', 'feather'])
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'DUMP', 'WORK_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_ingest(*args.child, args.chunk_size, args.columnar)
+        return
+
+    print(f"{'dump MB':>8} {'mode':>7} {'seconds':>8} {'base RSS MB':>12} {'peak RSS MB':>12} {'ingest MB':>10}")
+    for copies in args.copies:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dump_path = os.path.join(tmp_dir, 'dump.csv')
+            make_dump(dump_path, copies)
+            dump_mb = os.path.getsize(dump_path) / 1e6
+            for mode in ('batch', 'stream'):
+                work_dir = tempfile.mkdtemp(dir=tmp_dir)
+                command = [sys.executable, os.path.abspath(__file__), '--child', mode, dump_path, work_dir,
+                           '--chunk-size', str(args.chunk_size)]
+                if args.columnar:
+                    command += ['--columnar', args.columnar]
+                output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+                baseline, peak, elapsed = output.strip().splitlines()[-1].split()
+                baseline_mb, peak_mb = int(baseline) / 1024, int(peak) / 1024  # ru_maxrss dalam KB di Linux
+                print(f"{dump_mb:>8.1f} {mode:>7} {float(elapsed):>8.1f} {baseline_mb:>12.0f} {peak_mb:>12.0f} "
+                      f"{peak_mb - baseline_mb:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_index import LABEL_COLUMNS, LabelIndex
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def per_call(repeat, func):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+# Bandingkan query label dengan scan boolean pandas vs index bit-packed
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(DATA_DIR, 'cleaned_dataset_final.csv'))
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    labels = pd.read_csv(args.csv, usecols=LABEL_COLUMNS)
+    index = LabelIndex.from_frame(labels)
+    print(f"{len(labels)} rows; pandas labels {labels.memory_usage(deep=True).sum() / 1e3:.0f} KB, "
+          f"index {index.masks.nbytes / 1e3:.0f} KB")
+
+    queries = [
+        ('HS_Religion & HS_Strong & ~Abusive',
+         lambda: int(((labels['HS_Religion'] == 1) & (labels['HS_Strong'] == 1) & (labels['Abusive'] == 0)).sum()),
+         lambda: index.count(all_of=('HS_Religion', 'HS_Strong'), none_of=('Abusive',))),
+        ('co-occurrence (12 x 12)',
+         lambda: labels.T.dot(labels),
+         lambda: index.cooccurrence()),
+        ('correlation (12 x 12)',
+         lambda: labels.corr(),
+         lambda: index.correlation()),
+        ('crosstab HS x Abusive',
+         lambda: pd.crosstab(labels['HS'], labels['Abusive']),
+         lambda: index.crosstab('HS', 'Abusive')),
+    ]
+    print(f"{'query':<38} {'pandas ms':>10} {'index ms':>9} {'speedup':>8}")
+    for name, with_pandas, with_index in queries:
+        pandas_seconds = per_call(args.repeat, with_pandas)
+        index_seconds = per_call(args.repeat, with_index)
+        print(f"{name:<38} {pandas_seconds * 1000:>10.3f} {index_seconds * 1000:>9.3f} "
+              f"{pandas_seconds / index_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_cleaner import TextCleaner, read_decoded_csv, load_dictionaries
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+# Ukur kurva speedup cleansing data/dataset.csv terhadap jumlah worker
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='Daftar jumlah worker yang diukur (default: 1, 2, 4, ... sampai jumlah core)')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    dataset = read_decoded_csv(os.path.join(DATA_DIR, 'dataset.csv'))
+    kamusalay, abusive_words = load_dictionaries(os.path.join(DATA_DIR, 'new_kamusalay.csv'),
+                                                 os.path.join(DATA_DIR, 'abusive.csv'))
+    cleaner = TextCleaner(kamusalay, abusive_words)
+    tweets = dataset['Tweet'].tolist()
+
+    worker_counts = args.workers
+    if not worker_counts:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = sorted({1, cpu_count} | {2 ** i for i in range(cpu_count.bit_length()) if 2 ** i <= cpu_count})
+
+    baseline = None
+    print(f"{len(tweets)} tweets, chunk_size={args.chunk_size}, cpu_count={os.cpu_count()}")
+    print(f"{'workers':>7} {'seconds':>9} {'tweets/s':>10} {'speedup':>8}")
+    for workers in worker_counts:
+        # Ambil waktu terbaik dari beberapa pengulangan
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            cleaner.clean_many(tweets, workers=workers, chunk_size=args.chunk_size)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if baseline is None:
+            baseline = best
+        print(f"{workers:>7} {best:>9.3f} {len(tweets) / best:>10.0f} {baseline / best:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
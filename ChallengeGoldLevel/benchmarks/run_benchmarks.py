@@ -0,0 +1,173 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+import app as app_module
+from result_cache import CleanResultCache
+from text_cleaner import read_decoded_csv, load_text_cleaner
+
+DEFAULT_BASELINE = os.path.join(BASE_DIR, 'benchmarks/baseline.json')
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'benchmarks/results.json')
+
+# Ukuran sampel tetap dari data/dataset.csv supaya hasil antar run bisa dibandingkan
+SAMPLE_SIZE = 2000
+SAMPLE_SEED = 42
+
+
+# Catat satu metrik; higher_is_better menentukan arah regresi saat dibandingkan dengan baseline
+def metric(results, name, value, unit, higher_is_better):
+    results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+    print(f"  {name:<40} {value:>12.4f} {unit}")
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def latency_metrics(results, name, latencies):
+    latencies_ms = np.array(latencies) * 1000
+    for percentile in (50, 95, 99):
+        metric(results, f'{name}_p{percentile}_ms', float(np.percentile(latencies_ms, percentile)), 'ms', False)
+
+
+# 1. Throughput cleansing (tweet/detik)
+def bench_cleaning(results, cleaner, sample, repeat):
+    print("Cleaning throughput")
+    mini = read_decoded_csv(os.path.join(BASE_DIR, 'data/data_mini.csv'))['Tweet'].tolist()
+    elapsed = best_of(repeat, lambda: [cleaner.clean_many(mini) for _ in range(50)])
+    metric(results, 'clean_data_mini_tweets_per_s', 50 * len(mini) / elapsed, 'tweets/s', True)
+    elapsed = best_of(repeat, lambda: cleaner.clean_many(sample))
+    metric(results, 'clean_dataset_sample_tweets_per_s', len(sample) / elapsed, 'tweets/s', True)
+
+
+# 2. Startup load_and_clean_data dan kecepatan ingest save_to_sqlite
+def bench_storage(results, dataset, cleaner, repeat, tmp_dir):
+    print("Startup and storage")
+    metric(results, 'load_and_clean_data_warm_s', best_of(repeat, app_module.load_and_clean_data), 's', False)
+    build = lambda: load_text_cleaner(app_module.KAMUSALAY_PATH, app_module.ABUSIVE_PATH, artifact_path=None)
+    metric(results, 'cleaner_build_cold_s', best_of(repeat, build), 's', False)
+
+    dataset = dataset.copy()
+    dataset['cleaned_tweet'] = cleaner.clean_many(dataset['Tweet'])
+    db_path = os.path.join(tmp_dir, 'bench.db')
+    start = time.perf_counter()
+    app_module.save_to_sqlite(dataset, db_path=db_path)
+    metric(results, 'save_to_sqlite_rows_per_s', len(dataset) / (time.perf_counter() - start), 'rows/s', True)
+    start = time.perf_counter()
+    app_module.save_to_sqlite(dataset, db_path=db_path)
+    metric(results, 'save_to_sqlite_reingest_rows_per_s', len(dataset) / (time.perf_counter() - start),
+           'rows/s', True)
+
+
+# App Flask yang database, folder job dan status reload kamusnya ada di tmp_dir, supaya benchmark tidak
+# menyentuh tweets.db dan jobs/ milik working tree. Tanpa worker job dan follower reload kamus.
+def isolated_app(cleaner, tmp_dir):
+    app_module.SQLITE_DB_PATH = os.path.join(tmp_dir, 'app.db')
+    app_module.JOB_STORAGE_DIR = os.path.join(tmp_dir, 'jobs')
+    app_module.DICTIONARY_POLL_INTERVAL = 0
+    return app_module.create_app(cleaner, CleanResultCache(None, max_entries=0), job_workers=0)
+
+
+# 3. Latensi endpoint lewat Flask test client (cache dimatikan supaya yang diukur jalur cleansing)
+def bench_http(results, cleaner, sample, requests, tmp_dir):
+    print("HTTP latency")
+    client = isolated_app(cleaner, tmp_dir).test_client()
+
+    latencies = []
+    for text in sample[:requests]:
+        start = time.perf_counter()
+        client.post('/clean_text', data={'text': text})
+        latencies.append(time.perf_counter() - start)
+    latency_metrics(results, 'clean_text', latencies)
+
+    with open(os.path.join(BASE_DIR, 'data/data_mini.csv'), 'rb') as f:
+        mini_upload = f.read()
+    upload_100 = ('Tweet\n' + '\n'.join('"' + text.replace('"', '""') + '"' for text in sample[:100])).encode('utf-8')
+    for name, upload in (('upload_csv_mini', mini_upload), ('upload_csv_100_rows', upload_100)):
+        latencies = []
+        for _ in range(max(requests // 10, 10)):
+            start = time.perf_counter()
+            client.post('/upload_csv', data={'file': (io.BytesIO(upload), 'upload.csv')})
+            latencies.append(time.perf_counter() - start)
+        latency_metrics(results, name, latencies)
+
+
+# Bandingkan dengan baseline; metrik yang memburuk lebih dari threshold dianggap regresi
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or previous["value"] == 0:
+            continue
+        change = (current["value"] - previous["value"]) / previous["value"]
+        worse = -change if current["higher_is_better"] else change
+        status = 'REGRESSION' if worse > threshold else 'ok'
+        print(f"  {name:<40} {previous['value']:>12.4f} -> {current['value']:>12.4f} ({change:+.1%}) {status}")
+        if worse > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='File JSON hasil run ini')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='File JSON baseline pembanding')
+    parser.add_argument('--save-baseline', action='store_true', help='Simpan hasil run ini sebagai baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Batas penurunan relatif sebelum dianggap regresi (0.2 = 20%%)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=300, help='Jumlah request per endpoint untuk uji latensi')
+    args = parser.parse_args()
+
+    dataset = read_decoded_csv(app_module.DATASET_PATH)
+    sample = dataset['Tweet'].sample(n=SAMPLE_SIZE, random_state=SAMPLE_SEED).tolist()
+    cleaner = load_text_cleaner(app_module.KAMUSALAY_PATH, app_module.ABUSIVE_PATH, app_module.CLEANER_ARTIFACT_PATH)
+
+    metrics = {}
+    bench_cleaning(metrics, cleaner, sample, args.repeat)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bench_storage(metrics, dataset, cleaner, args.repeat, tmp_dir)
+        bench_http(metrics, cleaner, sample, args.requests, tmp_dir)
+
+    report = {"created_at": time.strftime('%Y-%m-%dT%H:%M:%S'), "python": platform.python_version(),
+              "machine": platform.machine(), "cpu_count": os.cpu_count(), "metrics": metrics}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["metrics"]
+    print(f"Comparison with baseline (threshold {args.threshold:.0%})")
+    regressions = compare(metrics, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app as app_module
+from tweet_search import TweetSearch
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+QUERIES = [
+    ('term', 'jokowi', (), ()),
+    ('term', 'presiden jokowi', (), ()),
+    ('phrase', 'presiden jokowi', (), ()),
+    ('prefix', 'ba', (), ()),
+    ('term', 'islam', ('HS',), ('Abusive',)),
+]
+
+
+# Ukur latensi /search (langsung lewat TweetSearch) atas dataset yang digandakan beberapa kali,
+# untuk melihat perilaku di atas ukuran korpus sekarang. Halaman pertama dan halaman terakhir (keyset) diukur.
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10], help='Kelipatan ukuran dataset')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    dataset = pd.read_csv(os.path.join(DATA_DIR, 'cleaned_dataset_final.csv'), keep_default_na=False)
+    for scale in args.scale:
+        copies = []
+        for i in range(scale):
+            copy = dataset.copy()
+            copy['Tweet'] = copy['Tweet'] + f' #{i}'  # Hash berbeda supaya setiap salinan jadi baris baru
+            copies.append(copy)
+        corpus = pd.concat(copies, ignore_index=True)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'search.db')
+            app_module.save_to_sqlite(corpus, db_path=db_path)
+            search = TweetSearch(db_path)
+            print(f"{len(corpus)} rows")
+            print(f"  {'mode':<7} {'query':<16} {'filter':<16} {'matches':>8} {'first ms':>9} {'last ms':>8}")
+            for mode, query, labels, exclude in QUERIES:
+                # Jalani semua halaman sekali untuk menghitung jumlah hasil dan id halaman terakhir
+                matches, after, last_after = 0, 0, 0
+                while after is not None:
+                    results, next_after = search.search(query, mode, labels, exclude, after=after, limit=100)
+                    matches += len(results)
+                    last_after, after = after, next_after
+
+                timings = []
+                for page_after in (0, last_after):
+                    start = time.perf_counter()
+                    for _ in range(args.repeat):
+                        search.search(query, mode, labels, exclude, after=page_after, limit=20)
+                    timings.append((time.perf_counter() - start) / args.repeat * 1000)
+                label_filter = '+'.join(labels) + ''.join(f' -{label}' for label in exclude)
+                print(f"  {mode:<7} {query:<16} {label_filter:<16} {matches:>8} {timings[0]:>9.2f} {timings[1]:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
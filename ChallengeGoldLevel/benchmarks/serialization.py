@@ -0,0 +1,86 @@
+import io
+import os
+import sys
+import csv
+import time
+import argparse
+import pandas as pd
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import serialization
+from serialization import encode_frame, compress
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+COLUMNS = ['Tweet', 'cleaned_tweet']
+
+
+def best_of(repeat, func):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def to_csv(df):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    writer.writerows(zip(*(df[column] for column in COLUMNS)))
+    return buffer.getvalue().encode()
+
+
+# Bandingkan serialisasi respons /upload_csv: cara lama (to_dict + jsonify) vs encode langsung dari kolom,
+# untuk --rows baris (dataset hasil cleansing digandakan), beserta ukuran setelah gzip/deflate
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--level', type=int, default=1, help='Level kompresi (sama dengan COMPRESSION_LEVEL)')
+    args = parser.parse_args()
+
+    dataset = pd.read_csv(os.path.join(DATA_DIR, 'cleaned_dataset_final.csv'), usecols=COLUMNS,
+                          keep_default_na=False)
+    copies = -(-args.rows // len(dataset))
+    df = pd.concat([dataset] * copies, ignore_index=True).iloc[:args.rows]
+
+    app = Flask(__name__)
+    orjson = serialization.orjson
+
+    def with_stdlib(func):
+        def run():
+            serialization.orjson = None
+            try:
+                return func()
+            finally:
+                serialization.orjson = orjson
+        return run
+
+    with app.app_context():
+        cases = [
+            ('to_dict + jsonify (before)', lambda: jsonify(df[COLUMNS].to_dict(orient="records")).get_data()),
+            ('records, json', with_stdlib(lambda: encode_frame(df, COLUMNS, 'records'))),
+            ('columns, json', with_stdlib(lambda: encode_frame(df, COLUMNS, 'columns'))),
+        ]
+        if orjson is not None:
+            cases += [
+                ('records, orjson', lambda: encode_frame(df, COLUMNS, 'records')),
+                ('columns, orjson', lambda: encode_frame(df, COLUMNS, 'columns')),
+            ]
+        cases.append(('csv', lambda: to_csv(df)))
+
+        print(f"{len(df)} rows, compression level {args.level}")
+        print(f"{'format':<28} {'encode ms':>10} {'MB':>7} {'gzip MB':>8} {'gzip ms':>8} {'deflate MB':>11}")
+        for name, func in cases:
+            seconds, body = best_of(args.repeat, func)
+            gzip_seconds, gzipped = best_of(1, lambda: compress(body, 'gzip', args.level))
+            deflated = compress(body, 'deflate', args.level)
+            print(f"{name:<28} {seconds * 1000:>10.1f} {len(body) / 1e6:>7.2f} {len(gzipped) / 1e6:>8.2f} "
+                  f"{gzip_seconds * 1000:>8.1f} {len(deflated) / 1e6:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tokenized_corpus import TokenizedCorpus, TokenizedCorpusWriter
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# Frekuensi dokumen per kata dari array CSR: pasangan (baris, token) unik lalu dihitung per token
+def document_frequency(corpus):
+    rows = np.repeat(np.arange(len(corpus), dtype=np.int64), corpus.lengths())
+    pairs = np.sort(rows * len(corpus.vocab) + corpus.tokens)
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    return np.bincount(pairs % len(corpus.vocab), minlength=len(corpus.vocab))
+
+
+# Bandingkan pekerjaan analisis yang biasa dimulai dari string cleaned_tweet (baca CSV + str.split)
+# dengan korpus token id yang di-memory-map
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(DATA_DIR, 'cleaned_dataset_final.csv'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = TokenizedCorpus.path_for(args.csv)
+    if not TokenizedCorpus.is_fresh(args.csv):
+        writer = TokenizedCorpusWriter(path)
+        writer.write(pd.read_csv(args.csv, keep_default_na=False))
+        writer.close()
+    corpus = TokenizedCorpus.load(path)
+    texts = pd.read_csv(args.csv, usecols=['cleaned_tweet'], keep_default_na=False)['cleaned_tweet']
+    print(f"{len(corpus)} rows, {len(corpus.tokens)} tokens, vocabulary {len(corpus.vocab)}")
+
+    cases = [
+        ('load',
+         lambda: pd.read_csv(args.csv, keep_default_na=False)['cleaned_tweet'].str.split().tolist(),
+         lambda: TokenizedCorpus.load(path)),
+        ('term counts',
+         lambda: Counter(word for text in texts for word in text.split()),
+         lambda: corpus.term_counts()),
+        ('document frequency',
+         lambda: Counter(word for text in texts for word in set(text.split())),
+         lambda: document_frequency(corpus)),
+        ('tokens per row',
+         lambda: texts.str.split().str.len(),
+         lambda: corpus.lengths()),
+    ]
+    print(f"{'task':<20} {'strings ms':>11} {'tokens ms':>10} {'speedup':>8}")
+    for name, with_strings, with_tokens in cases:
+        strings_seconds = best_of(args.repeat, with_strings)
+        tokens_seconds = best_of(args.repeat, with_tokens)
+        print(f"{name:<20} {strings_seconds * 1000:>11.2f} {tokens_seconds * 1000:>10.2f} "
+              f"{strings_seconds / tokens_seconds:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
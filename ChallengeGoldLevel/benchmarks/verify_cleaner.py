@@ -0,0 +1,159 @@
+import os
+import re
+import sys
+import random
+import argparse
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from text_cleaner import TextCleaner, WORD_PATTERN, read_decoded_csv, load_dictionaries
+
+DATASET_PATH = os.path.join(BASE_DIR, 'data/dataset.csv')
+EXPECTED_PATH = os.path.join(BASE_DIR, 'data/cleaned_dataset_final.csv')
+KAMUSALAY_PATH = os.path.join(BASE_DIR, 'data/new_kamusalay.csv')
+ABUSIVE_PATH = os.path.join(BASE_DIR, 'data/abusive.csv')
+
+
+# Loop regex lama (cleansing_text sebelum TextCleaner): setiap aturan kamus alay lalu abusive diterapkan
+# berurutan dengan re.sub. Pola dikompilasi sekali di sini supaya pengecekan tidak terlalu lama; hasilnya sama.
+class ReferenceCleaner:
+    def __init__(self, kamusalay, abusive_words):
+        rules = list(zip(kamusalay['alay_word'].tolist(), kamusalay['normal_word'].tolist()))
+        rules += [(word, '') for word in abusive_words['ABUSIVE'].tolist()]
+        self.rules = [(re.compile(r'\b{}\b'.format(re.escape(alay)), flags=re.IGNORECASE), normal)
+                      for alay, normal in rules]
+
+    def clean(self, text):
+        text = text.lower()
+        text = re.sub(r'\\x[\da-fA-F]{2}|\\n|\\t|[\t]', ' ', text)
+        text = re.sub(r'(\d\s*)+', ' ', text)
+        for pattern, normal in self.rules:
+            text = pattern.sub(normal, text)
+        text = re.sub(r'(\b\w+)(\d+)', lambda x: f"{x.group(1)}-{x.group(1)}", text)
+        text = re.sub(r'[^a-zA-Z\s]', '', text).strip()
+        return text
+
+
+# Kasus tepi dari kamus itu sendiri: kunci multi-kata, kunci dengan U+FFFD, kunci tanpa huruf/angka, dan rantai alay
+# (kata pengganti yang juga kunci aturan lain), disisipkan ke kalimat dengan huruf besar/kecil,
+# tanda baca, angka dan kata dataset acak di sekitarnya
+def edge_cases(kamusalay, abusive_words, tweets, count, seed):
+    rng = random.Random(seed)
+    rules = list(zip(kamusalay['alay_word'].tolist(), kamusalay['normal_word'].tolist()))
+    rules += [(word, '') for word in abusive_words['ABUSIVE'].tolist()]
+    keys = {alay.lower() for alay, _ in rules}
+    complex_keys = [alay for alay, _ in rules if not WORD_PATTERN.fullmatch(alay.lower())]
+    fffd_keys = [alay for alay, _ in rules if '\ufffd' in alay]
+    chain_keys = [alay for alay, normal in rules
+                  if any(word in keys and word != alay.lower() for word in WORD_PATTERN.findall(normal.lower()))]
+    all_keys = [alay for alay, _ in rules]
+    words = [word for tweet in tweets[:2000] for word in tweet.split()]
+    fillers = ['!', '?', '.', ',', '-', '2', '\\n', '\\x8f', '\t', '\ufffd', 'USER', 'RT']
+
+    def token():
+        choice = rng.random()
+        if choice < 0.25:
+            key = rng.choice(complex_keys)
+        elif choice < 0.35:
+            key = rng.choice(fffd_keys)
+        elif choice < 0.6:
+            key = rng.choice(chain_keys)
+        elif choice < 0.8:
+            key = rng.choice(all_keys)
+        else:
+            key = rng.choice(words)
+        if rng.random() < 0.3:
+            key = key.upper() if rng.random() < 0.5 else key.title()
+        if rng.random() < 0.2:
+            key += rng.choice(fillers)
+        return key
+
+    cases = []
+    for key in complex_keys + fffd_keys:
+        cases.append(f'{rng.choice(words)} {key} {rng.choice(words)}')
+        cases.append(f'{key.upper()}{rng.choice(fillers)}{key}')
+        cases.append(f'{rng.choice(words)}{key}{rng.choice(words)}')
+    while len(cases) < count:
+        separator = rng.choice([' ', ' ', ' ', '  ', ', '])
+        cases.append(separator.join(token() for _ in range(rng.randint(1, 12))))
+    return cases[:count]
+
+
+# Perubahan kamus untuk rebuild inkremental (previous=): hapus, ubah, dan tambah aturan, termasuk aturan
+# yang berada di tengah rantai, kunci kompleks baru, dan kunci tanpa karakter \w ('-', '..')
+def edited_dictionaries(kamusalay, abusive_words, seed):
+    rng = random.Random(seed)
+    kamusalay = kamusalay.copy()
+    keys = set(kamusalay['alay_word'].str.lower())
+    chain_rows = [i for i, normal in enumerate(kamusalay['normal_word'])
+                  if any(word in keys for word in WORD_PATTERN.findall(normal.lower()))]
+    changed = rng.sample(chain_rows, 20) + rng.sample(range(len(kamusalay)), 20)
+    kamusalay.loc[kamusalay.index[changed[:20]], 'normal_word'] = 'diubah'
+    kamusalay = kamusalay.drop(kamusalay.index[changed[20:]])
+    added = pd.DataFrame({'alay_word': ['diubah', 'tgg jwb bgt', 'gw\ufffd', 'knp', '-', '..'],
+                          'normal_word': ['berubah', 'tanggung jawab banget', 'saya', 'kenapa sih', 'dan', 'titik']})
+    kamusalay = pd.concat([kamusalay, added], ignore_index=True)
+    abusive_words = pd.concat([abusive_words, pd.DataFrame({'ABUSIVE': ['kampret banget']})], ignore_index=True)
+    return kamusalay, abusive_words
+
+
+def compare(name, texts, expected, actual, failures):
+    mismatches = [(text, want, got) for text, want, got in zip(texts, expected, actual) if want != got]
+    print(f"{name:<45} {len(texts) - len(mismatches):>6}/{len(texts)} match")
+    for text, want, got in mismatches[:5]:
+        print(f"    input:    {text!r}\n    expected: {want!r}\n    got:      {got!r}")
+    failures += bool(mismatches)
+    return failures
+
+
+# Pengecekan regresi TextCleaner: keluar dengan status 1 jika ada hasil yang berbeda
+#   1. seluruh data/dataset.csv dibandingkan dengan data/cleaned_dataset_final.csv
+#   2. kasus tepi dibandingkan dengan loop regex lama
+#   3. rebuild inkremental (previous=) dibandingkan dengan rebuild penuh setelah kamus diubah
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--expected', default=EXPECTED_PATH)
+    parser.add_argument('--cases', type=int, default=600,
+                        help='Jumlah kasus tepi yang dibandingkan dengan loop regex lama (sekitar 0,2 detik per kasus)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    kamusalay, abusive_words = load_dictionaries(KAMUSALAY_PATH, ABUSIVE_PATH)
+    cleaner = TextCleaner(kamusalay, abusive_words)
+    tweets = read_decoded_csv(DATASET_PATH)['Tweet'].tolist()
+    failures = 0
+
+    expected = pd.read_csv(args.expected, usecols=['cleaned_tweet'], dtype=str, keep_default_na=False)
+    if len(expected) != len(tweets):
+        print(f"{args.expected} has {len(expected)} rows, data/dataset.csv has {len(tweets)}")
+        failures += 1
+    else:
+        failures = compare('dataset.csv vs cleaned_dataset_final.csv', tweets, expected['cleaned_tweet'].tolist(),
+                           cleaner.clean_many(tweets), failures)
+
+    cases = edge_cases(kamusalay, abusive_words, tweets, args.cases, args.seed)
+    reference = ReferenceCleaner(kamusalay, abusive_words)
+    failures = compare('edge cases vs regex loop', cases, [reference.clean(text) for text in cases],
+                       cleaner.clean_many(cases), failures)
+
+    new_kamusalay, new_abusive = edited_dictionaries(kamusalay, abusive_words, args.seed)
+    full = TextCleaner(new_kamusalay, new_abusive)
+    incremental = TextCleaner(new_kamusalay, new_abusive, previous=cleaner)
+    sample = cases + tweets[:3000]
+    failures = compare('incremental vs full rebuild', sample, full.clean_many(sample),
+                       incremental.clean_many(sample), failures)
+    new_cases = edge_cases(new_kamusalay, new_abusive, tweets, args.cases // 3, args.seed + 1)
+    new_reference = ReferenceCleaner(new_kamusalay, new_abusive)
+    failures = compare('edited dictionary vs regex loop', new_cases, [new_reference.clean(text) for text in new_cases],
+                       incremental.clean_many(new_cases), failures)
+    if incremental.version != full.version or incremental._lookup != full._lookup:
+        print("incremental rebuild lookup table differs from full rebuild")
+        failures += 1
+
+    print("OK" if not failures else f"FAILED ({failures} check(s))")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
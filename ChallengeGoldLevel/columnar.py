@@ -0,0 +1,99 @@
+import os
+import pandas as pd
+
+# Format kolumnar yang didukung dan ekstensi filenya (butuh pyarrow)
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'feather': '.feather'}
+
+# Kolom teks dengan rasio nilai unik di bawah batas ini disimpan sebagai kategori (dictionary encoding).
+# Tweet hampir semuanya unik, jadi untuk dataset ini dictionary encoding tidak dipakai.
+DICTIONARY_MAX_RATIO = 0.5
+
+
+# Tipe data ringkas: kolom integer yang isinya hanya 0/1 (label) menjadi uint8,
+# teks berkardinalitas rendah menjadi category (kecuali categories=False)
+def compact_dtypes(dataset, categories=True):
+    dataset = dataset.copy()
+    for column in dataset.columns:
+        if pd.api.types.is_integer_dtype(dataset[column]) and dataset[column].isin((0, 1)).all():
+            dataset[column] = dataset[column].astype('uint8')
+        elif categories and (dataset[column].dtype == object or pd.api.types.is_string_dtype(dataset[column])):
+            if len(dataset) and dataset[column].nunique() / len(dataset) <= DICTIONARY_MAX_RATIO:
+                dataset[column] = dataset[column].astype('category')
+    return dataset
+
+
+# Lokasi file kolumnar di samping CSV, mis. data/cleaned_dataset_final.parquet
+def columnar_path(csv_path, fmt):
+    return os.path.splitext(csv_path)[0] + COLUMNAR_FORMATS[fmt]
+
+
+# File kolumnar masih sesuai CSV-nya jika ada dan tidak lebih lama dari CSV (aturan yang sama dengan
+# LabelIndex.is_fresh); CSV yang ditulis ulang, termasuk karena baris dihapus, membuatnya basi
+def columnar_is_fresh(csv_path, fmt):
+    path = columnar_path(csv_path, fmt)
+    return os.path.exists(path) and (not os.path.exists(csv_path)
+                                     or os.stat(path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns)
+
+
+# Cari file kolumnar di samping CSV yang tidak lebih lama dari CSV-nya; None jika tidak ada
+def find_columnar(csv_path):
+    for fmt in COLUMNAR_FORMATS:
+        if columnar_is_fresh(csv_path, fmt):
+            return columnar_path(csv_path, fmt)
+    return None
+
+
+# Simpan dataset dalam format kolumnar terkompresi (zstd), ditulis atomik lewat file sementara
+def save_columnar(dataset, path, fmt):
+    dataset = compact_dtypes(dataset).reset_index(drop=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    if fmt == 'parquet':
+        dataset.to_parquet(tmp_path, index=False, compression='zstd')
+    else:
+        dataset.to_feather(tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+
+# Tulis file kolumnar per potongan (ingest streaming), tanpa menampung seluruh dataset di memori.
+# Skema diambil dari potongan pertama; category tidak dipakai karena rasio nilai unik per potongan
+# tidak mewakili seluruh file. File baru menggantikan path setelah close().
+class ColumnarWriter:
+    def __init__(self, path, fmt):
+        import pyarrow  # ImportError di awal, sebelum ada potongan yang diproses
+        self.path = path
+        self.fmt = fmt
+        self._tmp_path = f'{path}.{os.getpid()}.tmp'
+        self._writer = None
+        self._schema = None
+
+    def write(self, chunk):
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+        table = pa.Table.from_pandas(compact_dtypes(chunk, categories=False), preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == 'parquet':
+                self._writer = pyarrow.parquet.ParquetWriter(self._tmp_path, self._schema, compression='zstd')
+            else:
+                options = pyarrow.ipc.IpcWriteOptions(compression='zstd')
+                self._writer = pyarrow.ipc.new_file(self._tmp_path, self._schema, options=options)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp_path, self.path)
+
+    # Batalkan penulisan, file lama (jika ada) tetap utuh
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(self._tmp_path)
+
+
+# Baca file kolumnar; columns membatasi kolom yang dibaca dari disk
+def read_columnar(path, columns=None):
+    if path.endswith(COLUMNAR_FORMATS['parquet']):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
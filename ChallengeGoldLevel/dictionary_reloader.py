@@ -0,0 +1,174 @@
+import os
+import time
+import threading
+
+from text_cleaner import load_text_cleaner
+from sqlite_connection import LocalConnection
+
+
+# Hot-reload kamus alay dan abusive tanpa restart server.
+# Cleaner baru dibangun di thread background (inkremental dari cleaner yang sedang aktif), lalu diserahkan
+# ke install() yang menggantinya dalam satu assignment: request yang sedang berjalan tetap memakai
+# referensi cleaner lama sampai selesai, request berikutnya memakai cleaner baru.
+# Dengan db_path, reload berlaku untuk semua proses (mis. worker gunicorn): request_reload() menaikkan nomor
+# generation di tabel dictionary_reload, dan setiap proses yang menjalankan ensure_following() memeriksanya
+# secara berkala lalu ikut reload jika generation-nya tertinggal.
+class DictionaryReloader:
+    def __init__(self, kamusalay_path, abusive_path, artifact_path, install, db_path=None):
+        self.sources = [kamusalay_path, abusive_path]
+        self.artifact_path = artifact_path
+        self.install = install
+        self.current = None      # TextCleaner yang sedang aktif (tanpa pembungkus metrics)
+        self._lock = threading.Lock()
+        self._building = False
+        self._pending = False    # Ada permintaan reload baru selama build berjalan
+        self._done = threading.Condition(self._lock)
+        self._watch_pid = None
+        self._follow_pid = None
+        self._stamps = None
+        self._db = LocalConnection(db_path) if db_path is not None else None
+        self.generation = 0      # Generation reload terakhir yang sudah diikuti proses ini
+        self.status = {"state": "idle", "version": None, "rule_count": 0, "build_seconds": None,
+                       "incremental": False, "reloaded_at": None, "builds": 0, "error": None}
+        if self._db is not None:
+            with self._db.get() as conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS dictionary_reload (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        generation INTEGER NOT NULL
+                    )
+                ''')
+                conn.execute('INSERT OR IGNORE INTO dictionary_reload (id, generation) VALUES (1, 0)')
+            self.generation = self._stored_generation()
+
+    # Status untuk endpoint admin; pid dan generation menunjukkan proses mana yang menjawab dan reload mana
+    # yang sudah diikutinya
+    def snapshot(self):
+        with self._lock:
+            return {**self.status, "pid": os.getpid(), "generation": self.generation}
+
+    # Catat cleaner yang sedang aktif (dipanggil saat startup dan setelah setiap swap)
+    def set_current(self, cleaner):
+        with self._lock:
+            self.current = cleaner
+            self.status.update(version=cleaner.version, rule_count=cleaner.rule_count)
+
+    # mtime dan ukuran file kamus, untuk mendeteksi perubahan oleh watcher
+    def _source_stamps(self):
+        stamps = []
+        for path in self.sources:
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    # Mulai rebuild di background. Jika build sedang berjalan, satu rebuild lagi dijadwalkan setelahnya
+    # supaya perubahan file yang terjadi di tengah build tidak terlewat.
+    # wait=True menunggu sampai tidak ada build yang berjalan, lalu mengembalikan status terakhir.
+    def reload(self, wait=False):
+        with self._lock:
+            if self._building:
+                self._pending = True
+            else:
+                self._building = True
+                self.status["state"] = "building"
+                threading.Thread(target=self._run, daemon=True).start()
+            if wait:
+                while self._building:
+                    self._done.wait()
+        return self.snapshot()
+
+    # Reload yang diminta lewat endpoint admin: generation dinaikkan supaya proses lain ikut reload,
+    # lalu proses ini langsung membangun ulang
+    def request_reload(self, wait=False):
+        if self._db is not None:
+            with self._db.get() as conn:
+                conn.execute('UPDATE dictionary_reload SET generation = generation + 1 WHERE id = 1')
+            generation = self._stored_generation()
+            with self._lock:
+                self.generation = max(self.generation, generation)
+        return self.reload(wait=wait)
+
+    def _stored_generation(self):
+        return self._db.get().execute('SELECT generation FROM dictionary_reload WHERE id = 1').fetchone()[0]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._pending = False
+                previous = self.current
+            stamps = self._source_stamps()
+            try:
+                start = time.perf_counter()
+                cleaner = load_text_cleaner(*self.sources, artifact_path=self.artifact_path, previous=previous)
+                build_seconds = time.perf_counter() - start
+                if previous is None or cleaner.version != previous.version:
+                    self.install(cleaner)
+                with self._lock:
+                    self.status.update(state="idle", build_seconds=round(build_seconds, 4),
+                                       incremental=previous is not None, error=None,
+                                       reloaded_at=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                                       builds=self.status["builds"] + 1)
+            except Exception as e:
+                print(f"Error reloading dictionaries: {e}")
+                with self._lock:
+                    self.status.update(state="failed", error=str(e))
+
+            with self._lock:
+                # Juga setelah gagal, supaya watcher tidak mencoba ulang file yang sama terus-menerus
+                self._stamps = stamps
+                if not self._pending:
+                    self._building = False
+                    self._done.notify_all()
+                    return
+
+    # Pantau file kamus setiap interval detik dan reload otomatis saat berubah.
+    # Thread watcher dibuat per process (thread tidak ikut tersalin saat gunicorn mem-fork worker),
+    # jadi aman dipanggil berulang dari setiap request.
+    def ensure_watching(self, interval):
+        if not interval or self._watch_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watch_pid == os.getpid():
+                return
+            self._watch_pid = os.getpid()
+            if self._stamps is None:
+                self._stamps = self._source_stamps()
+        threading.Thread(target=self._watch, args=(interval,), daemon=True).start()
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            if self._source_stamps() != self._stamps and not self._building:
+                print("Dictionary files changed, reloading")
+                self.reload()
+
+    # Ikuti reload dari proses lain: periksa generation di SQLite setiap interval detik.
+    # Sama seperti watcher, thread-nya dibuat per process dan aman dipanggil dari setiap request.
+    def ensure_following(self, interval):
+        if self._db is None or not interval or self._follow_pid == os.getpid():
+            return
+        with self._lock:
+            if self._follow_pid == os.getpid():
+                return
+            self._follow_pid = os.getpid()
+        threading.Thread(target=self._follow, args=(interval,), daemon=True).start()
+
+    # Diperiksa sekali langsung saat thread mulai (worker yang di-fork dari master membawa generation master)
+    def _follow(self, interval):
+        while True:
+            try:
+                generation = self._stored_generation()
+            except Exception as e:
+                print(f"Error reading dictionary reload generation: {e}")
+                generation = 0
+            with self._lock:
+                behind = generation > self.generation
+                if behind:
+                    self.generation = generation
+            if behind:
+                print(f"Dictionary reload {generation} requested by another process, reloading")
+                self.reload()
+            time.sleep(interval)
@@ -0,0 +1,20 @@
+import os
+import multiprocessing
+
+# Konfigurasi gunicorn untuk wsgi:app; semua nilai bisa diatur lewat environment variable
+bind = os.environ.get('BIND', '127.0.0.1:5000')
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+
+# Muat aplikasi (dan kamus) sekali di master sebelum fork, worker berbagi memorinya copy-on-write
+preload_app = True
+
+
+# Jalankan thread background (watcher/follower kamus, worker antrean job) di setiap worker begitu worker siap,
+# supaya job yang masih queued setelah restart langsung dilanjutkan tanpa menunggu request masuk
+def post_worker_init(worker):
+    start = getattr(worker.wsgi, 'start_background_threads', None)
+    if start is not None:
+        start()
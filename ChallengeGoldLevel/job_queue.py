@@ -0,0 +1,276 @@
+import os
+import csv
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import pandas as pd
+
+
+# True jika worker (format host:pid:thread) berjalan di host ini tetapi prosesnya sudah tidak ada
+def _local_worker_dead(worker):
+    host, pid, _ = (worker or '::').split(':')
+    if host != socket.gethostname() or not pid:
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+# Antrean sudah penuh (jumlah job queued + running mencapai batas)
+class QueueFull(Exception):
+    pass
+
+
+# Antrean job cleansing CSV besar dengan SQLite sebagai penyimpanan antrean.
+# Upload disimpan ke storage_dir dan dicatat di tabel jobs; worker (thread di proses web atau proses
+# terpisah yang memakai database yang sama) mengambil job, membersihkannya per potongan sambil mencatat
+# progres, lalu menulis hasilnya ke file CSV yang bisa diunduh. Karena status ada di SQLite, job tetap
+# ada setelah server restart; job 'running' yang heartbeat-nya basi (workernya mati) dikembalikan ke antrean.
+# Job done/failed beserta filenya dihapus retention_seconds setelah selesai.
+class JobQueue:
+    def __init__(self, db_path, storage_dir, max_pending=100, max_running=2, chunk_size=5000,
+                 stale_seconds=60, poll_interval=1.0, retention_seconds=86400, cleanup_interval=300):
+        self.db_path = db_path
+        self.storage_dir = storage_dir
+        self.max_pending = max_pending      # Batas job queued + running; lebih dari ini upload ditolak (429)
+        self.max_running = max_running      # Batas job yang diproses bersamaan, berlaku untuk semua proses
+        self.chunk_size = chunk_size
+        self.stale_seconds = stale_seconds
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.cleanup_interval = cleanup_interval
+        self._next_cleanup = 0
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._workers_pid = None
+        os.makedirs(storage_dir, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL,
+                    worker TEXT,
+                    upload_path TEXT NOT NULL,
+                    result_path TEXT,
+                    upload_bytes INTEGER,
+                    processed_rows INTEGER NOT NULL DEFAULT 0,
+                    progress REAL NOT NULL DEFAULT 0,
+                    error TEXT
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)')
+        finally:
+            conn.close()
+
+    # Koneksi autocommit; transaksi dibuka eksplisit dengan BEGIN IMMEDIATE saat mengambil job
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
+
+    # Simpan upload sebagai job baru; raise QueueFull jika antrean penuh
+    def submit(self, stream):
+        conn = self._connect()
+        try:
+            pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+            if pending >= self.max_pending:
+                raise QueueFull(f"Job queue is full ({pending} pending jobs)")
+
+            job_id = uuid.uuid4().hex
+            upload_path = os.path.join(self.storage_dir, f'{job_id}.upload.csv')
+            with open(upload_path, 'wb') as f:
+                while True:
+                    block = stream.read(1 << 20)
+                    if not block:
+                        break
+                    f.write(block)
+            conn.execute('''
+                INSERT INTO jobs (id, status, created_at, upload_path, upload_bytes) VALUES (?, 'queued', ?, ?, ?)
+            ''', (job_id, time.time(), upload_path, os.path.getsize(upload_path)))
+        finally:
+            conn.close()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        conn = self._connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            return dict(row) if row is not None else None
+        finally:
+            conn.close()
+
+    # Jumlah job per status, untuk /metrics
+    def counts(self):
+        conn = self._connect()
+        try:
+            return dict(conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        finally:
+            conn.close()
+
+    # Job running yang workernya sudah mati: langsung jika worker ada di host yang sama dan prosesnya tidak
+    # ada lagi (mis. server di-restart), selain itu setelah heartbeat basi
+    def _orphaned(self, running, now):
+        return [(job_id,) for job_id, owner, heartbeat_at in running
+                if heartbeat_at < now - self.stale_seconds or _local_worker_dead(owner)]
+
+    # Cek dengan baca biasa (tanpa lock tulis) apakah _claim punya pekerjaan: ada job yatim, atau ada job
+    # queued dan slot running masih tersisa. Worker yang menganggur jadi tidak mengantre lock tulis database.
+    def _has_work(self, conn, now):
+        running = conn.execute("SELECT id, worker, heartbeat_at FROM jobs WHERE status = 'running'").fetchall()
+        if self._orphaned(running, now):
+            return True
+        if len(running) >= self.max_running:
+            return False
+        return conn.execute("SELECT 1 FROM jobs WHERE status = 'queued' LIMIT 1").fetchone() is not None
+
+    # Ambil satu job queued secara atomik (aman dipakai banyak thread dan proses sekaligus).
+    # Job yatim dikembalikan ke antrean lebih dulu. Kondisi dicek ulang di dalam transaksi karena
+    # worker lain bisa saja lebih dulu mengambil job yang terlihat di _has_work.
+    def _claim(self, conn, worker):
+        now = time.time()
+        if not self._has_work(conn, now):
+            return None
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            running = conn.execute("SELECT id, worker, heartbeat_at FROM jobs WHERE status = 'running'").fetchall()
+            orphaned = self._orphaned(running, now)
+            conn.executemany('''
+                UPDATE jobs SET status = 'queued', worker = NULL, processed_rows = 0, progress = 0 WHERE id = ?
+            ''', orphaned)
+            running = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'running'").fetchone()[0]
+            row = None
+            if running < self.max_running:
+                row = conn.execute('''
+                    SELECT id, upload_path, upload_bytes FROM jobs WHERE status = 'queued'
+                    ORDER BY created_at LIMIT 1
+                ''').fetchone()
+            if row is not None:
+                conn.execute('''
+                    UPDATE jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ? WHERE id = ?
+                ''', (worker, now, now, row[0]))
+            conn.execute('COMMIT')
+            return row
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    # Bersihkan satu job per potongan; hasil ditulis ke file sementara lalu di-rename saat selesai
+    def _process(self, conn, job_id, upload_path, upload_bytes, cleaner):
+        result_path = os.path.join(self.storage_dir, f'{job_id}.result.csv')
+        tmp_path = f'{result_path}.tmp'
+        processed = 0
+        with open(upload_path, 'rb') as upload, open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out)
+            writer.writerow(['Tweet', 'cleaned_tweet'])
+            with pd.read_csv(upload, chunksize=self.chunk_size) as reader:
+                for chunk in reader:
+                    if 'Tweet' not in chunk.columns:
+                        raise ValueError("No 'tweet' column found in the file")
+                    tweets = chunk['Tweet'].fillna('').astype(str)
+                    writer.writerows(zip(tweets, cleaner.clean_many(tweets)))
+                    processed += len(chunk)
+                    progress = min(upload.tell() / upload_bytes, 0.99) if upload_bytes else 0.99
+                    conn.execute('UPDATE jobs SET processed_rows = ?, progress = ?, heartbeat_at = ? WHERE id = ?',
+                                 (processed, progress, time.time(), job_id))
+        os.replace(tmp_path, result_path)
+        conn.execute('''
+            UPDATE jobs SET status = 'done', result_path = ?, processed_rows = ?, progress = 1, finished_at = ?
+            WHERE id = ?
+        ''', (result_path, processed, time.time(), job_id))
+        # Upload asli tidak dibutuhkan lagi setelah hasilnya ada
+        os.remove(upload_path)
+
+    # Hapus job done/failed yang selesai lebih dari retention_seconds lalu beserta upload dan hasilnya,
+    # juga file di storage_dir yang tidak tercatat di tabel jobs (mis. sisa .tmp dari proses yang mati).
+    # Baris dihapus sebelum filenya supaya /jobs/<id>/result tidak menunjuk ke file yang sudah hilang.
+    def cleanup(self, now=None):
+        cutoff = (time.time() if now is None else now) - self.retention_seconds
+        conn = self._connect()
+        try:
+            expired = conn.execute('''
+                SELECT id, upload_path, result_path FROM jobs
+                WHERE status IN ('done', 'failed') AND finished_at < ?
+            ''', (cutoff,)).fetchall()
+            if expired:
+                conn.executemany('DELETE FROM jobs WHERE id = ?', [(job_id,) for job_id, _, _ in expired])
+            known = {job_id for job_id, in conn.execute('SELECT id FROM jobs')}
+        finally:
+            conn.close()
+
+        paths = [path for _, upload_path, result_path in expired for path in (upload_path, result_path) if path]
+        for name in os.listdir(self.storage_dir):
+            path = os.path.join(self.storage_dir, name)
+            if name.split('.')[0] not in known and os.path.getmtime(path) < cutoff:
+                paths.append(path)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return len(expired)
+
+    # cleanup() paling sering sekali per cleanup_interval per proses, dijalankan worker saat menganggur
+    def _maybe_cleanup(self):
+        with self._lock:
+            if time.monotonic() < self._next_cleanup:
+                return
+            self._next_cleanup = time.monotonic() + self.cleanup_interval
+        try:
+            self.cleanup()
+        except Exception as e:
+            print(f"Job cleanup failed: {e}")
+
+    # Loop worker: ambil job, proses, ulangi; tidur sebentar (atau sampai ada submit baru) jika antrean kosong.
+    # get_cleaner dipanggil per job supaya job baru memakai kamus terbaru setelah hot-reload.
+    def work(self, get_cleaner, stop=None):
+        worker = f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+        conn = self._connect()
+        try:
+            while stop is None or not stop.is_set():
+                cleaner = get_cleaner()
+                job = self._claim(conn, worker) if cleaner is not None else None
+                if job is None:
+                    self._maybe_cleanup()
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+                job_id, upload_path, upload_bytes = job
+                try:
+                    self._process(conn, job_id, upload_path, upload_bytes, cleaner)
+                except Exception as e:
+                    print(f"Job {job_id} failed: {e}")
+                    conn.execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                                 (str(e), time.time(), job_id))
+                    # Job gagal tidak diulang, jadi upload dan hasil setengah jadinya tidak dibutuhkan lagi
+                    for path in (upload_path, os.path.join(self.storage_dir, f'{job_id}.result.csv.tmp')):
+                        if os.path.exists(path):
+                            os.remove(path)
+        finally:
+            conn.close()
+
+    # Jalankan worker sebagai thread daemon di proses ini. Thread dibuat per process (tidak ikut tersalin
+    # saat gunicorn mem-fork worker), jadi aman dipanggil berulang dari setiap request.
+    def ensure_workers(self, count, get_cleaner):
+        if count <= 0 or self._workers_pid == os.getpid():
+            return
+        with self._lock:
+            if self._workers_pid == os.getpid():
+                return
+            self._workers_pid = os.getpid()
+        for _ in range(count):
+            threading.Thread(target=self.work, args=(get_cleaner,), daemon=True).start()
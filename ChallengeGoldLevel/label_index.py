@@ -0,0 +1,159 @@
+import os
+import json
+import shutil
+import numpy as np
+
+# Kolom label biner pada dataset (0/1); bit ke-i pada bitmask = LABEL_COLUMNS[i]
+LABEL_COLUMNS = ['HS', 'Abusive', 'HS_Individual', 'HS_Group', 'HS_Religion', 'HS_Race', 'HS_Physical',
+                 'HS_Gender', 'HS_Other', 'HS_Weak', 'HS_Moderate', 'HS_Strong']
+
+# Versi format file index; naikkan jika tata letak bit atau file berubah
+LABEL_INDEX_FORMAT = 1
+
+
+# Index label bit-packed: satu bitmask uint16 per tweet (12 label -> 2 byte per baris, bukan 12 x int64).
+# Query count/filter memakai operasi bitwise tervektorisasi atas seluruh array sekaligus, dan co-occurrence
+# dihitung dari histogram nilai bitmask (paling banyak 2^12 nilai berbeda) tanpa memindai per kolom.
+# Disimpan sebagai .npy (bisa di-memory-map) dengan file .json kecil berisi urutan kolom.
+class LabelIndex:
+    def __init__(self, masks, columns=LABEL_COLUMNS):
+        self.masks = masks
+        self.columns = list(columns)
+        self._bits = {column: 1 << i for i, column in enumerate(self.columns)}
+
+    # Bangun index dari DataFrame yang memiliki semua kolom label
+    @classmethod
+    def from_frame(cls, labels, columns=LABEL_COLUMNS):
+        flags = labels[list(columns)].to_numpy(dtype=np.uint16) != 0
+        weights = (np.uint16(1) << np.arange(len(columns), dtype=np.uint16))
+        return cls((flags * weights).sum(axis=1, dtype=np.uint16), columns)
+
+    # Lokasi index di samping CSV hasil cleansing, mis. data/cleaned_dataset_final.labels.npy
+    @staticmethod
+    def path_for(csv_path):
+        return os.path.splitext(csv_path)[0] + '.labels.npy'
+
+    # Index tidak lebih lama dari CSV sumbernya
+    @classmethod
+    def is_fresh(cls, csv_path):
+        npy_path, meta_path = cls.paths(cls.path_for(csv_path))
+        return (os.path.exists(npy_path) and os.path.exists(meta_path) and
+                (not os.path.exists(csv_path) or os.stat(npy_path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns))
+
+    @staticmethod
+    def paths(path):
+        base = os.path.splitext(path)[0]
+        return base + '.npy', base + '.json'
+
+    # Simpan index ke path .npy (urutan kolom disimpan di file .json dengan nama yang sama)
+    def save(self, path):
+        npy_path, meta_path = self.paths(path)
+        with open(meta_path, 'w') as f:
+            json.dump({"format": LABEL_INDEX_FORMAT, "columns": self.columns, "rows": len(self.masks)}, f)
+        tmp_path = f'{npy_path}.{os.getpid()}.tmp.npy'
+        np.save(tmp_path, self.masks)
+        os.replace(tmp_path, npy_path)
+
+    # Muat index; mmap=True memetakan file ke memori tanpa membacanya seluruhnya
+    @classmethod
+    def load(cls, path, mmap=True):
+        npy_path, meta_path = cls.paths(path)
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta["format"] != LABEL_INDEX_FORMAT:
+            raise ValueError(f"Unsupported label index format {meta['format']}")
+        return cls(np.load(npy_path, mmap_mode='r' if mmap else None), meta["columns"])
+
+    def __len__(self):
+        return len(self.masks)
+
+    # Gabungan bit dari beberapa nama label
+    def bits(self, columns):
+        try:
+            return sum(self._bits[column] for column in set(columns))
+        except KeyError as e:
+            raise ValueError(f"Unknown label {e.args[0]}") from None
+
+    # Mask boolean baris yang memiliki semua label all_of, minimal satu label any_of, dan tidak satu pun none_of
+    def select(self, all_of=(), none_of=(), any_of=()):
+        masks = self.masks
+        required = self.bits(all_of)
+        selected = (masks & required) == required
+        if none_of:
+            selected &= (masks & self.bits(none_of)) == 0
+        if any_of:
+            selected &= (masks & self.bits(any_of)) != 0
+        return selected
+
+    def count(self, all_of=(), none_of=(), any_of=()):
+        return int(np.count_nonzero(self.select(all_of, none_of, any_of)))
+
+    # Posisi baris (0-based, urutan dataset) yang cocok dengan filter
+    def rows(self, all_of=(), none_of=(), any_of=()):
+        return np.flatnonzero(self.select(all_of, none_of, any_of))
+
+    # Jumlah baris untuk setiap nilai bitmask
+    def histogram(self):
+        return np.bincount(self.masks, minlength=1 << len(self.columns))
+
+    # Matriks co-occurrence: [i, j] = jumlah baris dengan label i dan j sekaligus; diagonal = jumlah per label
+    def cooccurrence(self, columns=None):
+        columns = self.columns if columns is None else list(columns)
+        histogram = self.histogram()
+        values = np.flatnonzero(histogram)
+        counts = histogram[values]
+        bits = np.array([self._bits[column] for column in columns])
+        present = ((values[:, None] & bits[None, :]) != 0).astype(np.int64)
+        return (present * counts[:, None]).T @ present
+
+    # Crosstab 2x2 dua label: [[tidak a & tidak b, tidak a & b], [a & tidak b, a & b]]
+    def crosstab(self, a, b):
+        both = self.count(all_of=(a, b))
+        only_a = self.count(all_of=(a,)) - both
+        only_b = self.count(all_of=(b,)) - both
+        return np.array([[len(self) - both - only_a - only_b, only_b], [only_a, both]])
+
+    # Korelasi Pearson antar label, diturunkan dari co-occurrence (setara DataFrame.corr() untuk data 0/1)
+    def correlation(self, columns=None):
+        cooccurrence = self.cooccurrence(columns)
+        rows = len(self)
+        means = np.diag(cooccurrence) / rows
+        covariance = cooccurrence / rows - np.outer(means, means)
+        std = np.sqrt(np.diag(covariance))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = covariance / np.outer(std, std)
+        np.fill_diagonal(correlation, np.where(std > 0, 1.0, np.nan))
+        return correlation
+
+
+# Tulis index label per potongan (ingest streaming): bitmask setiap potongan ditambahkan ke file sementara,
+# lalu close() menulis header .npy dan menyalin isinya, jadi memori tidak bergantung pada jumlah baris.
+class LabelIndexWriter:
+    def __init__(self, path, columns=LABEL_COLUMNS):
+        self.path = path
+        self.columns = list(columns)
+        self.rows = 0
+        self._raw_path = f'{path}.{os.getpid()}.raw'
+        self._raw = open(self._raw_path, 'wb')
+
+    def write(self, chunk):
+        masks = LabelIndex.from_frame(chunk, self.columns).masks
+        self._raw.write(masks.astype('<u2', copy=False).tobytes())
+        self.rows += len(masks)
+
+    def close(self):
+        self._raw.close()
+        npy_path, meta_path = LabelIndex.paths(self.path)
+        with open(meta_path, 'w') as f:
+            json.dump({"format": LABEL_INDEX_FORMAT, "columns": self.columns, "rows": self.rows}, f)
+        tmp_path = f'{npy_path}.{os.getpid()}.tmp.npy'
+        with open(tmp_path, 'wb') as out, open(self._raw_path, 'rb') as raw:
+            np.lib.format.write_array_header_1_0(
+                out, {'descr': '<u2', 'fortran_order': False, 'shape': (self.rows,)})
+            shutil.copyfileobj(raw, out, 1 << 20)
+        os.remove(self._raw_path)
+        os.replace(tmp_path, npy_path)
+
+    def abort(self):
+        self._raw.close()
+        os.remove(self._raw_path)
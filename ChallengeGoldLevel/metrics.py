@@ -0,0 +1,117 @@
+import bisect
+import threading
+
+from text_cleaner import CLEAN_STAGES
+
+# Batas bucket histogram latensi request (detik) dan jumlah baris per upload
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Bucket terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    # labels: label tambahan tanpa kurung kurawal, mis. 'endpoint="/clean_text"'
+    def render(self, name, labels=''):
+        lines = []
+        cumulative = 0
+        prefix = f'{labels},' if labels else ''
+        suffix = f'{{{labels}}}' if labels else ''
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{suffix} {self.sum}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+        return lines
+
+
+# Registry metrik aplikasi: waktu kumulatif per tahap cleansing, histogram latensi request,
+# baris per upload, dan gauge (ukuran cache/kamus) yang dibaca saat /metrics di-scrape.
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = [0.0] * len(CLEAN_STAGES)
+        self.stage_calls = 0
+        self.request_latency = {}
+        self.upload_rows = Histogram(ROW_BUCKETS)
+        self._gauges = {}
+
+    # Dipanggil TextCleaner.clean_timed sekali per teks
+    def record_stages(self, durations):
+        with self._lock:
+            seconds = self.stage_seconds
+            for i, duration in enumerate(durations):
+                seconds[i] += duration
+            self.stage_calls += 1
+
+    def observe_request(self, endpoint, seconds):
+        with self._lock:
+            histogram = self.request_latency.get(endpoint)
+            if histogram is None:
+                histogram = self.request_latency[endpoint] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def observe_upload_rows(self, rows):
+        with self._lock:
+            self.upload_rows.observe(rows)
+
+    # Daftarkan metrik yang nilainya dibaca saat scrape: fungsi tanpa argumen yang mengembalikan nilai saat ini
+    def gauge(self, name, help_text, func, metric_type='gauge'):
+        self._gauges[name] = (help_text, func, metric_type)
+
+    # Format teks eksposisi Prometheus
+    def render(self):
+        with self._lock:
+            lines = ['# HELP clean_stage_seconds_total Cumulative time spent in each cleansing stage',
+                     '# TYPE clean_stage_seconds_total counter']
+            for stage, seconds in zip(CLEAN_STAGES, self.stage_seconds):
+                lines.append(f'clean_stage_seconds_total{{stage="{stage}"}} {seconds}')
+            lines += ['# HELP clean_stage_calls_total Number of texts that went through every cleansing stage',
+                      '# TYPE clean_stage_calls_total counter']
+            for stage in CLEAN_STAGES:
+                lines.append(f'clean_stage_calls_total{{stage="{stage}"}} {self.stage_calls}')
+
+            lines += ['# HELP http_request_duration_seconds Request latency per endpoint',
+                      '# TYPE http_request_duration_seconds histogram']
+            for endpoint, histogram in sorted(self.request_latency.items()):
+                lines += histogram.render('http_request_duration_seconds', f'endpoint="{endpoint}"')
+
+            lines += ['# HELP upload_rows Rows per /upload_csv request',
+                      '# TYPE upload_rows histogram']
+            lines += self.upload_rows.render('upload_rows')
+
+        for name, (help_text, func, metric_type) in self._gauges.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}', f'{name} {func()}']
+        return '\n'.join(lines) + '\n'
+
+
+# Pembungkus cleaner yang mencatat waktu tiap tahap; antarmukanya sama dengan TextCleaner
+class InstrumentedCleaner:
+    def __init__(self, cleaner, metrics):
+        self.cleaner = cleaner
+        self.metrics = metrics
+
+    @property
+    def version(self):
+        return self.cleaner.version
+
+    @property
+    def rule_count(self):
+        return self.cleaner.rule_count
+
+    def clean(self, text):
+        return self.cleaner.clean_timed(text, self.metrics.record_stages)
+
+    def clean_many(self, texts):
+        clean_timed = self.cleaner.clean_timed
+        record = self.metrics.record_stages
+        return [clean_timed(text, record) for text in texts]
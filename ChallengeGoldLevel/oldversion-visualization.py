@@ -1,9 +1,13 @@
+import sys
+import sqlite3
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from collections import Counter
 from wordcloud import WordCloud
 
+from text_cleaner import read_decoded_csv
+from term_index import TermIndex
+
 # Memuat data yang sudah dibersihkan
 df = pd.read_csv('data/cleaned_dataset_final.csv')
 
@@ -32,20 +36,16 @@ plt.xlabel("Abusive Speech (1 = Ada, 0 = Tidak Ada)")
 plt.ylabel("Jumlah Tweet")
 plt.show()
 
-# Menggabungkan semua tweet menjadi satu teks
-all_tweets = " ".join(df['cleaned_tweet'])
-
-# Membagi teks menjadi kata-kata
-words = all_tweets.split()
-
-# Menghitung frekuensi kata
-word_counts = Counter(words)
-
-# Memuat kata-kata abusive dari file abusive.csv
-abusive_words = pd.read_csv('data/cleaned_abusive.csv')['ABUSIVE'].tolist()
+# Memuat kata-kata abusive dari data/abusive.csv (didecode di memori seperti app.py)
+abusive_words = set(read_decoded_csv('data/abusive.csv')['ABUSIVE'])
 
-# Filter kata-kata abusive dari word_counts
-abusive_word_counts = {word: count for word, count in word_counts.items() if word in abusive_words}
+# Frekuensi kata diambil dari tabel term_counts di tweets.db (diperbarui setiap kali app.py menyimpan tweet),
+# tanpa menghitung ulang seluruh korpus. Tweet duplikat dihitung sebanyak barisnya di dataset, jadi
+# hasilnya sama dengan menghitung kata dari kolom cleaned_tweet di CSV.
+try:
+    abusive_word_counts = TermIndex('tweets.db').counts_for(abusive_words)
+except sqlite3.OperationalError as e:
+    sys.exit(f"tweets.db has no term counts yet, run app.py first ({e})")
 
 # Buat DataFrame dari kata-kata abusive
 abusive_df = pd.DataFrame(list(abusive_word_counts.items()), columns=['word', 'count']).sort_values(by='count', ascending=False)
@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import threading
+
+from text_cleaner import CLEAN_STAGES
+
+# Jumlah fungsi teratas (menurut waktu sendiri) yang dimasukkan ke laporan JSON
+PROFILE_TOP_FUNCTIONS = 30
+
+
+# Penjumlah waktu per tahap cleansing untuk satu request; antarmukanya sama dengan Metrics.record_stages
+# sehingga bisa dipasang ke InstrumentedCleaner. forward (opsional) meneruskan durasi ke Metrics global.
+class StageTimer:
+    def __init__(self, forward=None):
+        self.seconds = [0.0] * len(CLEAN_STAGES)
+        self.calls = 0
+        self._forward = forward
+
+    def record_stages(self, durations):
+        seconds = self.seconds
+        for i, duration in enumerate(durations):
+            seconds[i] += duration
+        self.calls += 1
+        if self._forward is not None:
+            self._forward(durations)
+
+
+# Profiling per request yang diminta secara eksplisit. Paling banyak satu request diprofil bersamaan dan
+# paling sering sekali per min_interval detik per proses; permintaan lain berjalan biasa tanpa profiler.
+# Hasil disimpan di directory sebagai <id>.json (ringkasan per fungsi dan per tahap) dan <id>.prof
+# (format pstats, bisa dibuka dengan snakeviz / python -m pstats); hanya max_files profil terbaru disimpan.
+class RequestProfiler:
+    def __init__(self, directory, min_interval=10.0, max_files=100):
+        self.directory = directory
+        self.min_interval = min_interval
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._active = False
+        self._last_start = None
+
+    # Mulai profiler untuk request ini; None jika sedang ada request lain yang diprofil atau terlalu cepat
+    def start(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._active or (self._last_start is not None and now - self._last_start < self.min_interval):
+                return None
+            self._active = True
+            self._last_start = now
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    # Hentikan profiler, simpan laporannya, dan kembalikan laporan tersebut
+    def finish(self, profile, profile_id, endpoint, elapsed, stages):
+        try:
+            profile.disable()
+            stats = pstats.Stats(profile)
+            functions = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+            report = {
+                "id": profile_id,
+                "endpoint": endpoint,
+                "created_at": time.time(),
+                "wall_seconds": elapsed,
+                "texts_cleaned": stages.calls,
+                "stages": dict(zip(CLEAN_STAGES, stages.seconds)),
+                "functions": [
+                    {"function": pstats.func_std_string(func), "calls": calls,
+                     "self_seconds": self_seconds, "cumulative_seconds": cumulative_seconds}
+                    for func, (_, calls, self_seconds, cumulative_seconds, _) in functions[:PROFILE_TOP_FUNCTIONS]
+                ],
+            }
+            os.makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(os.path.join(self.directory, f'{profile_id}.prof'))
+            with open(os.path.join(self.directory, f'{profile_id}.json'), 'w') as f:
+                json.dump(report, f, indent=2)
+            self._prune()
+            return report
+        finally:
+            with self._lock:
+                self._active = False
+
+    # Laporan JSON yang tersimpan; None jika tidak ada
+    def load(self, profile_id):
+        try:
+            with open(os.path.join(self.directory, f'{uuid.UUID(profile_id).hex}.json'), 'r') as f:
+                return json.load(f)
+        except (ValueError, OSError):
+            return None
+
+    # Hapus profil terlama jika jumlahnya melebihi max_files
+    def _prune(self):
+        reports = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in reports[:max(0, len(reports) - self.max_files)]:
+            for path in (entry.path, entry.path[:-len('.json')] + '.prof'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @staticmethod
+    def new_id():
+        return uuid.uuid4().hex
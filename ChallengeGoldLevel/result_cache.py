@@ -0,0 +1,145 @@
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from sqlite_connection import LocalConnection
+
+
+# Cache hasil cleansing dua tingkat:
+#   1. LRU di memori proses (dibatasi jumlah entri, entri paling lama tidak dipakai dibuang duluan)
+#   2. Tabel clean_cache di SQLite yang bertahan setelah restart dan dipakai bersama oleh semua worker
+# Kunci cache = hash dari versi kamus + teks input, jadi begitu kamus berubah (versi cleaner berbeda)
+# semua entri lama otomatis tidak terpakai lagi.
+# Hasil baru ditulis ke SQLite per batch (write_batch_size entri atau paling lama write_interval detik),
+# bukan satu commit per miss, dan tabelnya dibatasi max_persistent_entries baris (entri terlama dibuang).
+class CleanResultCache:
+    def __init__(self, db_path=None, max_entries=10000, max_text_length=2000, max_persistent_entries=100000,
+                 write_batch_size=100, write_interval=1.0):
+        self.db_path = db_path
+        self.max_entries = max_entries          # Kapasitas LRU di memori
+        self.max_text_length = max_text_length  # Teks yang lebih panjang tidak di-cache
+        self.max_persistent_entries = max_persistent_entries  # Kapasitas tabel clean_cache
+        self.write_batch_size = write_batch_size
+        self.write_interval = write_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = LocalConnection(db_path, {'journal_mode': 'WAL', 'synchronous': 'NORMAL'})
+        self._version = None
+        self._pending = []  # Entri (cache_key, version, cleaned_text) yang belum ditulis ke SQLite
+        self._last_write = time.monotonic()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path is not None:
+            # Koneksi sementara: cache bisa dibuat di master process sebelum fork (gunicorn --preload)
+            conn = sqlite3.connect(db_path, timeout=30)
+            try:
+                with conn:
+                    conn.execute('''
+                        CREATE TABLE IF NOT EXISTS clean_cache (
+                            cache_key TEXT PRIMARY KEY,
+                            version TEXT,
+                            cleaned_text TEXT
+                        )
+                    ''')
+            finally:
+                conn.close()
+
+    @staticmethod
+    def make_key(version, text):
+        return hashlib.sha1(f'{version}\0{text}'.encode('utf-8')).hexdigest()
+
+    # Versi kamus berganti: kosongkan LRU dan hapus entri persisten dari versi lain
+    def _switch_version(self, version):
+        with self._lock:
+            if self._version == version:
+                return
+            self._entries.clear()
+            self._pending.clear()
+            self._version = version
+        if self.db_path is not None:
+            with self._db.get() as conn:
+                conn.execute('DELETE FROM clean_cache WHERE version != ?', (version,))
+
+    # Ambil hasil cleansing dari cache, atau jalankan cleaner lalu simpan hasilnya
+    def clean(self, text, cleaner):
+        if len(text) > self.max_text_length:
+            return cleaner.clean(text)
+        version = cleaner.version
+        if version != self._version:
+            self._switch_version(version)
+        key = self.make_key(version, text)
+
+        with self._lock:
+            cleaned = self._entries.get(key)
+            if cleaned is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cleaned
+
+        if self.db_path is not None:
+            row = self._db.get().execute('SELECT cleaned_text FROM clean_cache WHERE cache_key = ?',
+                                         (key,)).fetchone()
+            if row is not None:
+                with self._lock:
+                    self.persistent_hits += 1
+                self._remember(key, row[0])
+                return row[0]
+
+        cleaned = cleaner.clean(text)
+        with self._lock:
+            self.misses += 1
+        self._remember(key, cleaned)
+        if self.db_path is not None:
+            with self._lock:
+                self._pending.append((key, version, cleaned))
+                due = (len(self._pending) >= self.write_batch_size
+                       or time.monotonic() - self._last_write >= self.write_interval)
+            if due:
+                self.flush()
+        return cleaned
+
+    # Tulis entri yang tertunda dalam satu transaksi, lalu buang entri terlama di luar max_persistent_entries.
+    # rowid naik setiap kali baris ditulis, jadi baris dengan rowid di bawah (rowid terbesar - kapasitas)
+    # adalah entri yang paling lama ditulis.
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_write = time.monotonic()
+        if not pending or self.db_path is None:
+            return
+        with self._db.get() as conn:
+            conn.executemany('INSERT OR REPLACE INTO clean_cache (cache_key, version, cleaned_text) VALUES (?, ?, ?)',
+                             pending)
+            conn.execute('DELETE FROM clean_cache WHERE rowid <= (SELECT MAX(rowid) FROM clean_cache) - ?',
+                         (self.max_persistent_entries,))
+
+    def _remember(self, key, cleaned):
+        with self._lock:
+            self._entries[key] = cleaned
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    # Statistik cache untuk endpoint /cache_stats
+    def stats(self):
+        with self._lock:
+            stats = {
+                "version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "pending_writes": len(self._pending),
+            }
+        if self.db_path is not None:
+            stats["max_persistent_entries"] = self.max_persistent_entries
+            stats["persistent_entries"] = self._db.get().execute('SELECT COUNT(*) FROM clean_cache').fetchone()[0]
+        return stats
@@ -0,0 +1,87 @@
+import json
+import zlib
+from json.encoder import encode_basestring_ascii
+
+# orjson opsional: jika terpasang dipakai untuk encode JSON (beberapa kali lebih cepat), jika tidak pakai modul json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bentuk respons JSON /upload_csv: records = array objek per baris, columns = satu array per kolom
+RESPONSE_FORMATS = ('records', 'columns')
+
+# Kompresi respons yang didukung lewat Accept-Encoding, dengan nilai wbits zlib untuk masing-masing
+COMPRESSION_WBITS = {'gzip': 31, 'deflate': 15}
+
+
+# Encode satu nilai JSON menjadi bytes; string (kasus umum) langsung lewat encoder C tanpa JSONEncoder
+def _encode_value(value):
+    if value.__class__ is str:
+        return encode_basestring_ascii(value).encode()
+    return json.dumps(value).encode()
+
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+# Isi kolom DataFrame sebagai list; NaN (sel kosong) menjadi None supaya di-encode sebagai null
+def _column_values(series):
+    if series.hasnans:
+        series = series.astype(object).where(series.notna(), None)
+    return series.tolist()
+
+
+# Template satu baris '{"kolom1":%b,"kolom2":%b}' untuk disisipi nilai yang sudah di-encode
+def _row_template(columns):
+    return b'{' + b','.join(_dumps(str(column)).replace(b'%', b'%%') + b':%b' for column in columns) + b'}'
+
+
+# Encode baris-baris DataFrame sebagai potongan objek JSON langsung dari list kolom,
+# tanpa membuat dict per baris seperti to_dict(orient="records")
+def _encode_rows(df, columns):
+    encode = orjson.dumps if orjson is not None else _encode_value
+    template = _row_template(columns)
+    values = [list(map(encode, _column_values(df[column]))) for column in columns]
+    return [template % row for row in zip(*values)]
+
+
+# Array JSON [{"Tweet": ..., "cleaned_tweet": ...}, ...] (bentuk respons /upload_csv selama ini)
+def encode_records(df, columns):
+    return b'[' + b','.join(_encode_rows(df, columns)) + b']'
+
+
+# Objek JSON {"Tweet": [...], "cleaned_tweet": [...]}; nama kolom tidak diulang di setiap baris
+def encode_columns(df, columns):
+    return _dumps({str(column): _column_values(df[column]) for column in columns})
+
+
+def encode_frame(df, columns, fmt='records'):
+    if fmt not in RESPONSE_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(RESPONSE_FORMATS)}")
+    return encode_records(df, columns) if fmt == 'records' else encode_columns(df, columns)
+
+
+# NDJSON: satu objek JSON per baris, untuk respons streaming
+def encode_ndjson(df, columns):
+    rows = _encode_rows(df, columns)
+    rows.append(b'')
+    return b'\n'.join(rows)
+
+
+def compress(data, encoding, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, COMPRESSION_WBITS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+# Kompres respons streaming per potongan; setiap potongan di-flush supaya klien tetap menerima hasil bertahap
+def compress_stream(chunks, encoding, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, COMPRESSION_WBITS[encoding])
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,23 @@
+import os
+import sqlite3
+import threading
+
+
+# Koneksi SQLite per thread dan per process. Koneksi sqlite3 tidak boleh dipakai lintas thread atau dibawa
+# ke proses hasil fork (gunicorn --preload), jadi setiap thread di setiap proses membuka koneksinya sendiri
+# saat pertama kali dipakai. Dipakai bersama oleh CleanResultCache, TweetSearch dan TermIndex.
+class LocalConnection:
+    def __init__(self, db_path, pragmas=None):
+        self.db_path = db_path
+        self.pragmas = pragmas or {}
+        self._local = threading.local()
+
+    def get(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            for name, value in self.pragmas.items():
+                conn.execute(f'PRAGMA {name} = {value}')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
@@ -0,0 +1,132 @@
+from label_index import LABEL_COLUMNS
+from sqlite_connection import LocalConnection
+
+# Kolom hitungan di tabel term_counts per pilihan label pada /top_terms
+TERM_COUNT_COLUMNS = {'all': 'total', 'HS': 'hs', 'Abusive': 'abusive'}
+TOP_TERMS_DEFAULT_K = 20
+TOP_TERMS_MAX_K = 1000
+
+_HS_BIT = 1 << LABEL_COLUMNS.index('HS')
+_ABUSIVE_BIT = 1 << LABEL_COLUMNS.index('Abusive')
+
+
+# Pastikan tabel term_counts ada: jumlah kemunculan setiap kata di baris dataset, total dan per label
+# (kemunculan di baris berlabel HS / Abusive). Tweet duplikat disimpan sekali di cleaned_tweets, tetapi
+# dihitung sebanyak barisnya (kolom occurrences), jadi hitungannya sama dengan menghitung langsung dari CSV.
+# Database lama diisi sekali dari isi cleaned_tweets.
+def ensure_term_counts_table(conn):
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'term_counts'").fetchone()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS term_counts (
+            term TEXT PRIMARY KEY,
+            total INTEGER NOT NULL,
+            hs INTEGER NOT NULL,
+            abusive INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    for column in TERM_COUNT_COLUMNS.values():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_term_counts_{column} ON term_counts ({column} DESC, term)')
+    if not exists:
+        rows = conn.execute('SELECT cleaned_tweet, occurrences, hs_occurrences, abusive_occurrences FROM cleaned_tweets')
+        apply_term_deltas(conn, add_term_counts({}, rows, 1))
+
+
+# Jumlah baris dataset yang diwakili satu tweet: (total, berlabel HS, berlabel Abusive).
+# labels None berarti dataset tanpa kolom label.
+def label_occurrences(labels, count=1):
+    labels = labels or 0
+    return (count, count if labels & _HS_BIT else 0, count if labels & _ABUSIVE_BIT else 0)
+
+
+# Tambahkan hitungan kata dari baris (cleaned_tweet, occurrences, hs_occurrences, abusive_occurrences)
+# ke deltas, dikalikan sign (+1 / -1)
+def add_term_counts(deltas, rows, sign):
+    for cleaned, total, hs, abusive in rows:
+        if not cleaned or not total:
+            continue
+        total, hs, abusive = sign * total, sign * hs, sign * abusive
+        for term in cleaned.split():
+            counts = deltas.get(term)
+            if counts is None:
+                deltas[term] = [total, hs, abusive]
+            else:
+                counts[0] += total
+                counts[1] += hs
+                counts[2] += abusive
+    return deltas
+
+
+# Siapkan satu batch upsert cleaned_tweets dan delta hitungan katanya. Baris batch berisi
+# (original_tweet, cleaned_tweet, content_hash, labels, occurrences, hs_occurrences, abusive_occurrences).
+# Hash di accumulate sudah ditulis lebih dulu di sinkronisasi yang sama (potongan sebelumnya pada ingest
+# streaming), jadi jumlah kemunculannya ditambahkan; selain itu jumlah kemunculan diganti nilai batch.
+# labels None (dataset tanpa kolom label) mempertahankan label lama.
+# Baris lama dikurangi dari deltas dan baris baru ditambahkan; baris yang tidak berubah dibuang dari batch.
+# Harus dipanggil sebelum batch di-upsert, supaya isi lama masih bisa dibaca.
+def batch_term_deltas(conn, batch, deltas, existing_rows=True, accumulate=()):
+    existing = {}
+    if existing_rows:
+        hashes = [row[2] for row in batch]
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            existing.update((row[0], row[1:]) for row in conn.execute(
+                f'SELECT content_hash, cleaned_tweet, labels, occurrences, hs_occurrences, abusive_occurrences '
+                f'FROM cleaned_tweets WHERE content_hash IN ({",".join("?" * len(chunk))})', chunk))
+    removed, added, rows = [], [], []
+    for tweet, cleaned, content_hash, labels, total, hs, abusive in batch:
+        old = existing.get(content_hash)
+        if labels is None and old is not None:
+            labels = old[1]
+            _, hs, abusive = label_occurrences(labels, total)
+        if old is not None and content_hash in accumulate:
+            total, hs, abusive = old[2] + total, old[3] + hs, old[4] + abusive
+        new = (cleaned, labels, total, hs, abusive)
+        if old == new:
+            continue
+        if old is not None:
+            removed.append((old[0], *old[2:]))
+        added.append((cleaned, total, hs, abusive))
+        rows.append((tweet, cleaned, content_hash, labels, total, hs, abusive))
+    add_term_counts(deltas, removed, -1)
+    add_term_counts(deltas, added, 1)
+    return rows
+
+
+def apply_term_deltas(conn, deltas):
+    conn.executemany('''
+        INSERT INTO term_counts (term, total, hs, abusive) VALUES (?, ?, ?, ?)
+        ON CONFLICT (term) DO UPDATE SET
+            total = total + excluded.total, hs = hs + excluded.hs, abusive = abusive + excluded.abusive
+    ''', ((term, *counts) for term, counts in deltas.items() if any(counts)))
+    conn.execute('DELETE FROM term_counts WHERE total <= 0')
+
+
+# Query top-k kata dari term_counts (untuk /top_terms dan grafik kata)
+class TermIndex:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._db = LocalConnection(db_path)
+
+    # k kata paling sering; label = 'all', 'HS', atau 'Abusive'
+    def top_terms(self, k=TOP_TERMS_DEFAULT_K, label='all'):
+        if label not in TERM_COUNT_COLUMNS:
+            raise ValueError(f"label must be one of {', '.join(TERM_COUNT_COLUMNS)}")
+        column = TERM_COUNT_COLUMNS[label]
+        k = max(1, min(k, TOP_TERMS_MAX_K))
+        rows = self._db.get().execute(
+            f'SELECT term, {column} FROM term_counts WHERE {column} > 0 ORDER BY {column} DESC, term LIMIT ?', (k,))
+        return [{"term": term, "count": count} for term, count in rows]
+
+    # Hitungan untuk daftar kata tertentu (mis. kata abusive), dalam bentuk {kata: jumlah}
+    def counts_for(self, terms, label='all'):
+        column = TERM_COUNT_COLUMNS[label]
+        conn = self._db.get()
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS wanted_terms (term TEXT PRIMARY KEY)')
+        with conn:
+            conn.execute('DELETE FROM wanted_terms')
+            conn.executemany('INSERT OR IGNORE INTO wanted_terms (term) VALUES (?)', ((term,) for term in terms))
+            rows = conn.execute(f'''
+                SELECT t.term, t.{column} FROM term_counts t JOIN wanted_terms w ON w.term = t.term
+                WHERE t.{column} > 0
+            ''').fetchall()
+        return dict(rows)
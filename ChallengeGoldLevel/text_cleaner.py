@@ -0,0 +1,372 @@
+import re
+import io
+import os
+import time
+import heapq
+import pickle
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Pola token kata, sama dengan definisi \b pada regex Python
+WORD_PATTERN = re.compile(r'\w+')
+
+# Langkah-langkah regex tetap pada pipeline pembersihan, dikompilasi sekali saja
+ESCAPE_PATTERN = re.compile(r'\\x[\da-fA-F]{2}|\\n|\\t|[\t]')  # Escape chars
+DIGIT_PATTERN = re.compile(r'(\d\s*)+')  # Urutan angka yang tidak relevan
+REPEAT_PATTERN = re.compile(r'(\b\w+)(\d+)')  # Pengulangan seperti "cantik2"
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')  # Karakter non-alfabet
+
+# Nama tahap pipeline cleansing, urutannya sama dengan clean_timed (alay dan abusive diproses dalam satu lintasan)
+CLEAN_STAGES = ('lowercase', 'escape', 'digits', 'dictionary', 'repetition', 'non_alpha')
+
+# Versi format artefak cleaner di disk; naikkan jika struktur internal TextCleaner berubah
+ARTIFACT_FORMAT = 2
+
+
+# Mesin pembersih teks: semua regex dan kamus (alay + abusive) dikompilasi sekali saat konstruksi.
+# Setelah dibuat, isinya tidak pernah diubah sehingga aman dipakai bersama oleh banyak thread.
+class TextCleaner:
+    __slots__ = ('_version', '_rules', '_lookup', '_reach', '_rules_by_token', '_complex_patterns',
+                 '_complex_tokens', '_complex_chars', '_complex_by_token', '_tokenless', '_replacement_chars')
+
+    # previous: cleaner versi sebelumnya (opsional). Jika diberikan, regex kunci kompleks dan hasil
+    # resolve/reach untuk kunci yang tidak terpengaruh perubahan kamus dipakai ulang (rebuild inkremental).
+    def __init__(self, kamusalay, abusive_words, previous=None):
+        # Aturan disusun sesuai urutan loop lama: semua kata alay, lalu kata abusive (diganti '')
+        rules = list(zip(kamusalay['alay_word'].tolist(), kamusalay['normal_word'].tolist()))
+        rules += [(word, '') for word in abusive_words['ABUSIVE'].tolist()]
+        reused_patterns = previous._complex_patterns_by_key() if previous is not None else {}
+        known_simple = previous._lookup if previous is not None else {}
+
+        # Kunci yang seluruhnya \w cocok tepat dengan satu token utuh -> cukup lookup hash.
+        # Kunci lain (mengandung spasi, '-', '\ufffd', dst.) ditangani dengan regex aslinya.
+        simple_rules = {}
+        rules_by_token = {}
+        complex_patterns = {}
+        complex_tokens = {}
+        complex_chars = {}
+        complex_by_token = {}
+        tokenless = []
+        for index, (alay, normal) in enumerate(rules):
+            key = alay.lower()
+            if key in known_simple:
+                simple_rules.setdefault(key, []).append(index)
+                rules_by_token.setdefault(key, []).append(index)
+                continue
+            tokens = frozenset(WORD_PATTERN.findall(key))
+            if WORD_PATTERN.fullmatch(key):
+                simple_rules.setdefault(key, []).append(index)
+            else:
+                pattern = reused_patterns.get(alay)
+                if pattern is None:
+                    pattern = re.compile(r'\b{}\b'.format(re.escape(alay)), flags=re.IGNORECASE)
+                complex_patterns[index] = pattern
+                complex_tokens[index] = tokens
+                complex_chars[index] = frozenset(WORD_PATTERN.sub('', key)) - {' '}
+                for token in tokens:
+                    complex_by_token.setdefault(token, []).append(index)
+                # Kunci tanpa karakter \w (mis. '-' atau '..') tidak masuk index token mana pun
+                if not tokens:
+                    tokenless.append(index)
+            for token in tokens:
+                rules_by_token.setdefault(token, []).append(index)
+
+        # Kunci yang hasil lookup dan reach-nya sama dengan cleaner sebelumnya tidak perlu dihitung ulang
+        reusable = previous._unaffected_keys(rules, simple_rules) if previous is not None else set()
+
+        # Hasil akhir satu token setelah rantai penggantian aturan ke-start dan sesudahnya
+        resolved = {(key, 0): previous._lookup[key] for key in reusable}
+        def resolve(token, start):
+            if (token, start) not in resolved:
+                result = token
+                for index in simple_rules.get(token.lower(), ()):
+                    if index >= start:
+                        result = WORD_PATTERN.sub(lambda m: resolve(m.group(), index + 1), rules[index][1])
+                        break
+                resolved[(token, start)] = result
+            return resolved[(token, start)]
+
+        # Semua token yang mungkin muncul dari sebuah token lewat aturan sederhana
+        reach = {key: previous._reach[key] for key in reusable}
+        for key in simple_rules:
+            if key in reusable:
+                continue
+            seen = {key}
+            stack = [key]
+            while stack:
+                for index in simple_rules.get(stack.pop(), ()):
+                    for produced in WORD_PATTERN.findall(rules[index][1].lower()):
+                        if produced not in seen:
+                            seen.add(produced)
+                            stack.append(produced)
+            reach[key] = frozenset(seen)
+
+        # Versi kamus: berubah setiap kali isi atau urutan aturan berubah
+        digest = hashlib.sha1()
+        for alay, normal in rules:
+            digest.update(f'{alay}\0{normal}\n'.encode('utf-8'))
+
+        set_attr = object.__setattr__
+        set_attr(self, '_version', digest.hexdigest()[:16])
+        set_attr(self, '_rules', tuple(rules))
+        set_attr(self, '_lookup', {key: resolve(key, 0) for key in simple_rules})
+        set_attr(self, '_reach', reach)
+        set_attr(self, '_rules_by_token', {token: tuple(indexes) for token, indexes in rules_by_token.items()})
+        set_attr(self, '_complex_patterns', complex_patterns)
+        set_attr(self, '_complex_tokens', complex_tokens)
+        set_attr(self, '_complex_chars', complex_chars)
+        set_attr(self, '_complex_by_token', {token: tuple(indexes) for token, indexes in complex_by_token.items()})
+        set_attr(self, '_tokenless', tuple(tokenless))
+        # Karakter non-\w yang bisa muncul dari hasil penggantian
+        set_attr(self, '_replacement_chars', frozenset(WORD_PATTERN.sub('', ''.join(normal for _, normal in rules))))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('TextCleaner bersifat immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('TextCleaner bersifat immutable')
+
+    # Versi kamus yang dipakai cleaner ini
+    @property
+    def version(self):
+        return self._version
+
+    # Jumlah aturan kamus (alay + abusive)
+    @property
+    def rule_count(self):
+        return len(self._rules)
+
+    # Regex kunci kompleks per teks kunci aslinya, untuk dipakai ulang saat rebuild
+    def _complex_patterns_by_key(self):
+        return {self._rules[index][0]: pattern for index, pattern in self._complex_patterns.items()}
+
+    # Kunci sederhana yang aturannya, dan aturan semua token yang bisa dihasilkannya, tidak berubah
+    # di daftar aturan baru. Syaratnya urutan relatif aturan yang tidak berubah tetap sama
+    # (hanya ada penambahan/penghapusan/perubahan entri); jika tidak, tidak ada yang dipakai ulang.
+    def _unaffected_keys(self, rules, simple_rules):
+        old_counts = Counter(self._rules)
+        new_counts = Counter(rules)
+        changed = {alay.lower() for alay, _ in (old_counts - new_counts) + (new_counts - old_counts)}
+        if [rule for rule in self._rules if rule[0].lower() not in changed] != \
+                [rule for rule in rules if rule[0].lower() not in changed]:
+            return set()
+        return {key for key in simple_rules
+                if key not in changed and key in self._reach and not (self._reach[key] & changed)}
+
+    # Dukungan pickle (dibutuhkan worker process dengan start method 'spawn')
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    # Cek apakah sebuah aturan kompleks mungkin cocok di teks (termasuk hasil rantai penggantian)
+    def _needs_complex_rules(self, text, tokens):
+        reachable = set()
+        for token in tokens:
+            reachable |= self._reach.get(token, {token})
+        available_chars = set(text) | self._replacement_chars
+        for index in self._tokenless:
+            if self._complex_chars[index] <= available_chars:
+                return True
+        for token in reachable:
+            for index in self._complex_by_token.get(token, ()):
+                if self._complex_tokens[index] <= reachable and self._complex_chars[index] <= available_chars:
+                    return True
+        return False
+
+    # Jalur lengkap: terapkan aturan yang mungkin cocok, berurutan seperti loop lama
+    def _apply_rules_in_order(self, text):
+        pending = []
+        queued = set()
+
+        def queue_candidates(current_index, text):
+            for token in set(WORD_PATTERN.findall(text.lower())):
+                for index in self._rules_by_token.get(token, ()):
+                    if index > current_index and index not in queued:
+                        queued.add(index)
+                        heapq.heappush(pending, index)
+
+        # Aturan tanpa token selalu diantrekan; cocok atau tidaknya ditentukan regex-nya
+        for index in self._tokenless:
+            queued.add(index)
+            heapq.heappush(pending, index)
+        queue_candidates(-1, text)
+        while pending:
+            index = heapq.heappop(pending)
+            queued.discard(index)
+            alay, normal = self._rules[index]
+            if index in self._complex_patterns:
+                new_text = self._complex_patterns[index].sub(normal, text)
+            else:
+                # Kunci sederhana = satu token utuh, setara dengan \bkunci\b tanpa kompilasi regex
+                key = alay.lower()
+                new_text = WORD_PATTERN.sub(lambda m: normal if m.group().lower() == key else m.group(), text)
+            if new_text != text:
+                text = new_text
+                queue_candidates(index, text)
+        return text
+
+    # Normalisasi kata alay dan hapus kata abusive
+    def normalize(self, text):
+        tokens = WORD_PATTERN.findall(text)
+        if self._needs_complex_rules(text, tokens):
+            return self._apply_rules_in_order(text)
+        # Satu lintasan kiri-ke-kanan: lookup hash per token
+        lookup = self._lookup
+        return WORD_PATTERN.sub(lambda m: lookup.get(m.group(), m.group()), text)
+
+    # Bersihkan satu teks
+    def clean(self, text):
+        text = text.lower()
+        text = ESCAPE_PATTERN.sub(' ', text)  # Hapus escape chars
+        text = DIGIT_PATTERN.sub(' ', text)  # Hapus urutan angka yang tidak relevan
+        text = self.normalize(text)  # Normalisasi kata alay dan hapus kata abusive
+        text = REPEAT_PATTERN.sub(lambda x: f"{x.group(1)}-{x.group(1)}", text)  # Tangani pengulangan
+        text = NON_ALPHA_PATTERN.sub('', text).strip()  # Hapus karakter non-alfabet
+        return text
+
+    # Sama dengan clean, tetapi mencatat durasi tiap tahap (urutan CLEAN_STAGES) lewat record(durations)
+    def clean_timed(self, text, record):
+        clock = time.perf_counter
+        t0 = clock()
+        text = text.lower()
+        t1 = clock()
+        text = ESCAPE_PATTERN.sub(' ', text)
+        t2 = clock()
+        text = DIGIT_PATTERN.sub(' ', text)
+        t3 = clock()
+        text = self.normalize(text)
+        t4 = clock()
+        text = REPEAT_PATTERN.sub(lambda x: f"{x.group(1)}-{x.group(1)}", text)
+        t5 = clock()
+        text = NON_ALPHA_PATTERN.sub('', text).strip()
+        t6 = clock()
+        record((t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4, t6 - t5))
+        return text
+
+    # Bersihkan banyak teks sekaligus, urutan hasil sama dengan urutan input.
+    # workers > 1 membagi teks menjadi potongan dan membersihkannya di ProcessPoolExecutor;
+    # workers=0 berarti pakai semua core. executor (dari process_pool) dipakai ulang jika diberikan,
+    # supaya pemanggil yang memproses banyak potongan tidak membuat pool baru setiap kali.
+    def clean_many(self, texts, workers=1, chunk_size=1000, executor=None):
+        if executor is None:
+            pool = self.process_pool(workers)
+            if pool is None:
+                clean = self.clean
+                return [clean(text) for text in texts]
+            with pool:
+                return self.clean_many(texts, chunk_size=chunk_size, executor=pool)
+
+        texts = list(texts)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results = []
+        for cleaned in executor.map(_clean_chunk, chunks):
+            results.extend(cleaned)
+        return results
+
+    # Pool worker process untuk clean_many(executor=...); None jika workers (0 = semua core) tidak lebih
+    # dari 1. Kamus dikirim sekali per worker lewat initializer, bukan per task. Pemanggil menutupnya.
+    def process_pool(self, workers):
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            return None
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,))
+
+
+# Cleaner milik worker process, diisi oleh _init_worker saat worker dibuat
+_worker_cleaner = None
+
+
+def _init_worker(cleaner):
+    global _worker_cleaner
+    _worker_cleaner = cleaner
+
+
+def _clean_chunk(texts):
+    return _worker_cleaner.clean_many(texts)
+
+
+# Baca CSV mentah dan decode di memori dengan errors='replace', tanpa file sementara
+def read_decoded_csv(path, **kwargs):
+    with open(path, 'rb') as f:
+        raw_data = f.read()
+    return pd.read_csv(io.StringIO(raw_data.decode('utf-8', errors='replace')), **kwargs)
+
+
+# Versi bertahap read_decoded_csv untuk file besar: byte didecode sedikit demi sedikit (errors='replace'
+# dengan hasil yang sama) dan CSV dibaca per potongan chunksize baris, jadi memori tidak ikut membesar
+def read_decoded_csv_chunks(path, chunksize, **kwargs):
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        with pd.read_csv(f, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
+
+
+# Muat kamus alay dan daftar kata abusive
+def load_dictionaries(kamusalay_path, abusive_path):
+    kamusalay = read_decoded_csv(kamusalay_path, header=None, names=['alay_word', 'normal_word'])
+    abusive_words = read_decoded_csv(abusive_path)
+    return kamusalay, abusive_words
+
+
+# sha1 isi file, dibaca per blok 1 MB (juga dipakai analytics.py untuk kunci cache agregat)
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Sidik jari file sumber kamus: mtime dan ukuran untuk cek cepat, sha1 untuk cek isi
+def _source_fingerprints(paths):
+    fingerprints = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprints.append({"path": os.path.abspath(path), "mtime_ns": stat.st_mtime_ns,
+                             "size": stat.st_size, "sha1": file_sha1(path)})
+    return fingerprints
+
+
+def _sources_unchanged(fingerprints, paths):
+    if [fp["path"] for fp in fingerprints] != [os.path.abspath(path) for path in paths]:
+        return False
+    for fp in fingerprints:
+        stat = os.stat(fp["path"])
+        if stat.st_mtime_ns == fp["mtime_ns"] and stat.st_size == fp["size"]:
+            continue
+        # mtime berubah (mis. file di-touch atau di-checkout ulang): bandingkan isinya
+        if stat.st_size != fp["size"] or file_sha1(fp["path"]) != fp["sha1"]:
+            return False
+    return True
+
+
+# Muat TextCleaner dari artefak hasil kompilasi di disk bila file kamus tidak berubah,
+# jika tidak bangun ulang dari CSV lalu simpan artefak baru.
+# previous: cleaner yang sedang aktif, dipakai untuk rebuild inkremental saat hot-reload.
+def load_text_cleaner(kamusalay_path, abusive_path, artifact_path=None, previous=None):
+    sources = [kamusalay_path, abusive_path]
+    if artifact_path is not None and os.path.exists(artifact_path):
+        try:
+            with open(artifact_path, 'rb') as f:
+                artifact = pickle.load(f)
+            if artifact["format"] == ARTIFACT_FORMAT and _sources_unchanged(artifact["sources"], sources):
+                return artifact["cleaner"]
+        except Exception as e:
+            print(f"Ignoring unreadable cleaner artifact {artifact_path}: {e}")
+
+    cleaner = TextCleaner(*load_dictionaries(kamusalay_path, abusive_path), previous=previous)
+    if artifact_path is not None:
+        artifact = {"format": ARTIFACT_FORMAT, "sources": _source_fingerprints(sources), "cleaner": cleaner}
+        os.makedirs(os.path.dirname(os.path.abspath(artifact_path)), exist_ok=True)
+        # Tulis ke file sementara lalu rename, supaya proses lain tidak membaca artefak setengah jadi
+        tmp_path = f'{artifact_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, artifact_path)
+    return cleaner
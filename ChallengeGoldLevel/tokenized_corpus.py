@@ -0,0 +1,191 @@
+import os
+import json
+import shutil
+import itertools
+import numpy as np
+import pandas as pd
+
+from label_index import LABEL_COLUMNS
+
+# Versi format file korpus token; naikkan jika tata letak file berubah
+TOKENIZED_CORPUS_FORMAT = 1
+
+# Jumlah elemen per blok saat menyalin/memetakan ulang array besar di TokenizedCorpusWriter.close()
+COPY_BLOCK_SIZE = 1 << 20
+
+
+# Korpus cleaned_tweet dalam bentuk token id (tata letak CSR): token baris i adalah
+# tokens[offsets[i]:offsets[i + 1]] (int32), dengan vocab[id] = kata. Id diurutkan dari kata paling sering
+# (id 0), jadi membatasi vocabulary ke k kata teratas cukup dengan tokens < k. Label (uint8, satu kolom per
+# label) sejajar dengan baris. Semua array disimpan sebagai .npy yang bisa di-memory-map.
+class TokenizedCorpus:
+    def __init__(self, tokens, offsets, vocab, labels=None, label_columns=LABEL_COLUMNS):
+        self.tokens = tokens
+        self.offsets = offsets
+        self.vocab = vocab
+        self.labels = labels
+        self.label_columns = list(label_columns)
+
+    # Lokasi korpus di samping CSV hasil cleansing, mis. data/cleaned_dataset_final.tokens.npy
+    @staticmethod
+    def path_for(csv_path):
+        return os.path.splitext(csv_path)[0] + '.tokens.npy'
+
+    # File-file korpus: token, offset baris, label, vocabulary (satu kata per baris) dan metadata
+    @staticmethod
+    def paths(path):
+        base = os.path.splitext(os.path.splitext(path)[0])[0]
+        return {"tokens": base + '.tokens.npy', "offsets": base + '.offsets.npy',
+                "labels": base + '.token_labels.npy', "vocab": base + '.vocab.txt', "meta": base + '.tokens.json'}
+
+    # Korpus tidak lebih lama dari CSV sumbernya
+    @classmethod
+    def is_fresh(cls, csv_path):
+        meta_path = cls.paths(cls.path_for(csv_path))["meta"]
+        return (os.path.exists(meta_path) and
+                (not os.path.exists(csv_path) or os.stat(meta_path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns))
+
+    # Muat korpus; mmap=True memetakan array ke memori tanpa menyalinnya
+    @classmethod
+    def load(cls, path, mmap=True):
+        paths = cls.paths(path)
+        with open(paths["meta"], 'r') as f:
+            meta = json.load(f)
+        if meta["format"] != TOKENIZED_CORPUS_FORMAT:
+            raise ValueError(f"Unsupported tokenized corpus format {meta['format']}")
+        mmap_mode = 'r' if mmap else None
+        with open(paths["vocab"], 'r', encoding='utf-8') as f:
+            vocab = f.read().split('\n')[:meta["vocab_size"]]
+        labels = np.load(paths["labels"], mmap_mode=mmap_mode) if meta["label_columns"] else None
+        return cls(np.load(paths["tokens"], mmap_mode=mmap_mode), np.load(paths["offsets"], mmap_mode=mmap_mode),
+                   vocab, labels, meta["label_columns"])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # Token id baris i
+    def row(self, i):
+        return self.tokens[self.offsets[i]:self.offsets[i + 1]]
+
+    # Kata-kata baris i (kebalikan dari tokenisasi)
+    def decode(self, i):
+        return [self.vocab[token] for token in self.row(i)]
+
+    # Jumlah token per baris
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    # Frekuensi setiap kata di seluruh korpus, diindeks dengan token id
+    def term_counts(self):
+        return np.bincount(self.tokens, minlength=len(self.vocab))
+
+    # Matriks bag-of-words scipy.sparse (baris x vocabulary) langsung dari array CSR, tanpa string Python.
+    # vocab_size membatasi kolom ke kata-kata paling sering.
+    def bag_of_words(self, vocab_size=None):
+        from scipy import sparse
+        if vocab_size is None or vocab_size >= len(self.vocab):
+            matrix = sparse.csr_matrix((np.ones(len(self.tokens), dtype=np.int32), self.tokens, self.offsets),
+                                       shape=(len(self), len(self.vocab)))
+        else:
+            keep = self.tokens < vocab_size
+            offsets = np.concatenate(([0], np.cumsum(keep)))[self.offsets]
+            matrix = sparse.csr_matrix((np.ones(int(offsets[-1]), dtype=np.int32), self.tokens[keep], offsets),
+                                       shape=(len(self), vocab_size))
+        matrix.sum_duplicates()
+        return matrix
+
+
+# Tulis korpus token per potongan (dipakai main(), baik dari DataFrame utuh maupun ingest streaming).
+# Selama menulis, id diberikan menurut urutan kemunculan dan token ditambahkan ke file sementara; close()
+# mengurutkan ulang vocabulary menurut frekuensi dan memetakan ulang token per blok, jadi memori hanya
+# sebanding dengan ukuran vocabulary, bukan jumlah baris.
+class TokenizedCorpusWriter:
+    def __init__(self, path, label_columns=LABEL_COLUMNS):
+        self.path = path
+        self.label_columns = list(label_columns)
+        self.rows = 0
+        self.token_count = 0
+        self._vocab = {}
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._tmp_base = f'{path}.{os.getpid()}'
+        self._raw = {name: open(f'{self._tmp_base}.{name}.raw', 'wb') for name in ('tokens', 'lengths', 'labels')}
+
+    def write(self, chunk):
+        words = [text.split() for text in chunk['cleaned_tweet'].fillna('').tolist()]
+        codes, uniques = pd.factorize(pd.Series(list(itertools.chain.from_iterable(words)), dtype=object))
+        vocab = self._vocab
+        ids = np.array([vocab.setdefault(word, len(vocab)) for word in uniques], dtype=np.int32)
+        tokens = ids[codes] if len(codes) else np.zeros(0, dtype=np.int32)
+        counts = np.bincount(tokens, minlength=len(vocab))
+        counts[:len(self._counts)] += self._counts
+        self._counts = counts
+
+        self._raw["tokens"].write(tokens.astype('<i4', copy=False).tobytes())
+        self._raw["lengths"].write(np.fromiter(map(len, words), dtype='<i8', count=len(words)).tobytes())
+        if self.label_columns:
+            self._raw["labels"].write(chunk[self.label_columns].to_numpy(dtype=np.uint8).tobytes())
+        self.rows += len(chunk)
+        self.token_count += len(tokens)
+
+    def close(self):
+        for raw in self._raw.values():
+            raw.close()
+        paths = TokenizedCorpus.paths(self.path)
+        terms = list(self._vocab)
+        # Id baru: frekuensi menurun, kata yang sama frekuensinya diurutkan alfabetis
+        order = np.lexsort((np.array(terms, dtype=str), -self._counts)) if terms else np.zeros(0, dtype=np.int64)
+        remap = np.empty(len(terms), dtype=np.int32)
+        remap[order] = np.arange(len(terms), dtype=np.int32)
+
+        written = []
+        with self._output(paths["tokens"], written) as out, open(f'{self._tmp_base}.tokens.raw', 'rb') as raw:
+            np.lib.format.write_array_header_1_0(out, {'descr': '<i4', 'fortran_order': False,
+                                                       'shape': (self.token_count,)})
+            while True:
+                block = np.fromfile(raw, dtype='<i4', count=COPY_BLOCK_SIZE)
+                if not len(block):
+                    break
+                out.write(remap[block].tobytes())
+        with self._output(paths["offsets"], written) as out, open(f'{self._tmp_base}.lengths.raw', 'rb') as raw:
+            np.lib.format.write_array_header_1_0(out, {'descr': '<i8', 'fortran_order': False,
+                                                       'shape': (self.rows + 1,)})
+            total = np.zeros(1, dtype='<i8')
+            out.write(total.tobytes())
+            while True:
+                block = np.fromfile(raw, dtype='<i8', count=COPY_BLOCK_SIZE)
+                if not len(block):
+                    break
+                offsets = np.cumsum(block) + total[0]
+                out.write(offsets.tobytes())
+                total[0] = offsets[-1]
+        if self.label_columns:
+            with self._output(paths["labels"], written) as out, open(f'{self._tmp_base}.labels.raw', 'rb') as raw:
+                np.lib.format.write_array_header_1_0(out, {'descr': '|u1', 'fortran_order': False,
+                                                           'shape': (self.rows, len(self.label_columns))})
+                shutil.copyfileobj(raw, out, COPY_BLOCK_SIZE)
+        with self._output(paths["vocab"], written) as out:
+            out.write('\n'.join(terms[i] for i in order).encode('utf-8'))
+        with self._output(paths["meta"], written) as out:
+            out.write(json.dumps({"format": TOKENIZED_CORPUS_FORMAT, "rows": self.rows, "tokens": self.token_count,
+                                  "vocab_size": len(terms), "label_columns": self.label_columns}).encode())
+
+        # Semua file baru dipasang sekaligus di akhir, metadata terakhir (dipakai sebagai penanda is_fresh)
+        for tmp_path, path in written:
+            os.replace(tmp_path, path)
+        self._remove_raw()
+
+    def abort(self):
+        for raw in self._raw.values():
+            raw.close()
+        self._remove_raw()
+
+    def _output(self, path, written):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        written.append((tmp_path, path))
+        return open(tmp_path, 'wb')
+
+    def _remove_raw(self):
+        for name in self._raw:
+            path = f'{self._tmp_base}.{name}.raw'
+            if os.path.exists(path):
+                os.remove(path)
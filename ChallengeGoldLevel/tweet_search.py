@@ -0,0 +1,68 @@
+import re
+
+from label_index import LABEL_COLUMNS
+from sqlite_connection import LocalConnection
+
+# Mode query /search: term = semua kata harus ada, phrase = kata berurutan, prefix = setiap kata sebagai awalan
+SEARCH_MODES = ('term', 'phrase', 'prefix')
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Teks hasil cleansing hanya berisi huruf kecil dan spasi, jadi query dipecah dengan pola yang sama
+QUERY_TOKEN_PATTERN = re.compile(r'[a-z]+')
+
+
+# Pencarian full-text atas tabel cleaned_tweets lewat index FTS5 cleaned_tweets_fts.
+# Paginasi keyset: hasil diurutkan berdasarkan id, halaman berikutnya diminta dengan after=<id terakhir>,
+# sehingga biaya per halaman tetap walaupun halaman ke-sekian (tanpa OFFSET).
+class TweetSearch:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._db = LocalConnection(db_path)
+        self._bits = {column: 1 << i for i, column in enumerate(LABEL_COLUMNS)}
+
+    # Ubah input pengguna menjadi ekspresi MATCH FTS5; setiap kata dikutip supaya sintaks FTS tidak bisa disisipkan
+    @staticmethod
+    def match_expression(query, mode='term'):
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"mode must be one of {', '.join(SEARCH_MODES)}")
+        tokens = QUERY_TOKEN_PATTERN.findall(query.lower())
+        if not tokens:
+            raise ValueError("Query must contain at least one word")
+        if mode == 'phrase':
+            return '"' + ' '.join(tokens) + '"'
+        suffix = '*' if mode == 'prefix' else ''
+        return ' '.join(f'"{token}"{suffix}' for token in tokens)
+
+    def label_bits(self, labels):
+        bits = 0
+        for label in labels:
+            if label not in self._bits:
+                raise ValueError(f"Unknown label {label}")
+            bits |= self._bits[label]
+        return bits
+
+    # Cari tweet; labels = semua label ini harus 1, exclude = semua label ini harus 0.
+    # Mengembalikan (hasil, id untuk parameter after halaman berikutnya atau None)
+    def search(self, query, mode='term', labels=(), exclude=(), after=0, limit=SEARCH_DEFAULT_LIMIT):
+        required = self.label_bits(labels)
+        excluded = self.label_bits(exclude)
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+        sql = '''
+            SELECT t.id, t.original_tweet, t.cleaned_tweet, t.labels
+            FROM cleaned_tweets_fts f JOIN cleaned_tweets t ON t.id = f.rowid
+            WHERE cleaned_tweets_fts MATCH ? AND f.rowid > ?
+        '''
+        params = [self.match_expression(query, mode), after]
+        if required or excluded:
+            sql += ' AND (t.labels & ?) = ? AND (t.labels & ?) = 0'
+            params += [required, required, excluded]
+        sql += ' ORDER BY f.rowid LIMIT ?'
+        params.append(limit + 1)  # Satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+
+        rows = self._db.get().execute(sql, params).fetchall()
+        results = [{"id": row_id, "original_tweet": original, "cleaned_tweet": cleaned,
+                    "labels": None if mask is None else [column for column, bit in self._bits.items() if mask & bit]}
+                   for row_id, original, cleaned, mask in rows[:limit]]
+        next_after = results[-1]["id"] if len(rows) > limit else None
+        return results, next_after
@@ -1,41 +1,36 @@
 import os
-import pandas as pd
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import seaborn as sns
-import re
+
+from text_cleaner import TextCleaner, read_decoded_csv, load_dictionaries
+from analytics import load_analytics, correlation_frame
+from columnar import find_columnar
+from label_index import LabelIndex
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Output cleansing dari app.py (pipeline inkremental); label tweet dibaca dari sini tanpa membersihkan ulang
+CLEANED_DATASET_PATH = os.path.join(CURRENT_DIR, 'data/cleaned_dataset_final.csv')
+DATASET_PATH = os.path.join(CURRENT_DIR, 'data/dataset.csv')
+# Cache agregat label (distribusi, crosstab, korelasi), dikunci dengan hash file dataset
+ANALYTICS_CACHE_PATH = os.path.join(CURRENT_DIR, 'cache/analytics.json')
+
+# Manifest di direktori output: hash input tiap grafik pada render terakhir, untuk melewati grafik yang tidak berubah.
+# Naikkan RENDER_FORMAT jika kode plot berubah supaya semua grafik dirender ulang.
+RENDER_MANIFEST = '.render_manifest.json'
+RENDER_FORMAT = 1
 
 # Fungsi untuk memuat dan membersihkan data
 def load_and_clean_data():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    dataset_path = os.path.join(current_dir, 'data/dataset.csv')
-    abusive_path = os.path.join(current_dir, './data/abusive.csv')
-    kamusalay_path = os.path.join(current_dir, './data/new_kamusalay.csv')
-
-    # Baca file CSV dalam mode byte
-    with open(dataset_path, 'rb') as f:
-        raw_data = f.read()
-    with open(abusive_path, 'rb') as f:
-        raw_abusive = f.read()
-    with open(kamusalay_path, 'rb') as f:
-        raw_kamusalay = f.read()
-
-    # Decode byte data dengan errors='replace'
-    decoded_data = raw_data.decode('utf-8', errors='replace')
-    decoded_abusive = raw_abusive.decode('utf-8', errors='replace')
-    decoded_kamusalay = raw_kamusalay.decode('utf-8', errors='replace')
-
-    # Simpan data yang sudah didecode ke CSV sementara
-    with open('cleaned_dataset.csv', 'w', encoding='utf-8') as f:
-        f.write(decoded_data)
-    with open('cleaned_abusive.csv', 'w', encoding='utf-8') as f:
-        f.write(decoded_abusive)
-    with open('cleaned_kamusalay.csv', 'w', encoding='utf-8') as f:
-        f.write(decoded_kamusalay)
-
-    # Membaca kembali file CSV yang sudah dibersihkan
-    dataset = pd.read_csv('cleaned_dataset.csv')
-    abusive_words = pd.read_csv('cleaned_abusive.csv')
-    kamusalay = pd.read_csv('cleaned_kamusalay.csv', header=None, names=['alay_word', 'normal_word'])
+    abusive_path = os.path.join(CURRENT_DIR, './data/abusive.csv')
+    kamusalay_path = os.path.join(CURRENT_DIR, './data/new_kamusalay.csv')
+
+    # Decode byte data dengan errors='replace' langsung di memori, tanpa CSV sementara
+    dataset = read_decoded_csv(DATASET_PATH)
+    kamusalay, abusive_words = load_dictionaries(kamusalay_path, abusive_path)
 
     # Lihat struktur data
     print("Struktur Dataset:")
@@ -53,43 +48,13 @@ def load_and_clean_data():
 
     return dataset, abusive_words, kamusalay
 
-# Fungsi untuk membersihkan teks dari kata alay dan abusive
-def cleansing_text(text, kamusalay, abusive_words):
-    text = text.lower()
-    text = re.sub(r'\\x[\da-fA-F]{2}', '', text)  # Hapus escape chars
-    text = re.sub(r'\\n|\\t', ' ', text)  # Hapus \n, \t
-    text = re.sub(r'(\d\s*)+', ' ', text)  # Hapus urutan angka yang tidak relevan
-    
-    # Ganti kata alay dengan kata normal
-    for _, row in kamusalay.iterrows():
-        text = re.sub(r'\b{}\b'.format(re.escape(row['alay_word'])), row['normal_word'], text, flags=re.IGNORECASE)
-    
-    # Hapus kata abusive
-    for word in abusive_words['ABUSIVE']:
-        text = re.sub(r'\b{}\b'.format(re.escape(word)), '', text, flags=re.IGNORECASE)
-    
-    # Hilangkan karakter non-alfabet yang tersisa
-    text = re.sub(r'[^a-zA-Z\s]', '', text).strip()
-    
-    return text
-
-# Fungsi utama untuk melakukan eksplorasi data dan visualisasi
-def main():
-    # Muat dan bersihkan data
-    dataset, abusive_words, kamusalay = load_and_clean_data()
-
-    # Terapkan pembersihan pada kolom tweet
-    dataset['cleaned_tweet'] = dataset['Tweet'].apply(lambda x: cleansing_text(x, kamusalay, abusive_words))
-
-    # Simpan dataset yang sudah dibersihkan
-    dataset.to_csv('cleaned_dataset_final.csv', index=False)
-    print("Dataset sudah dibersihkan dan disimpan ke 'cleaned_dataset_final.csv'")
-
-    # 1. Visualisasi Distribusi Hate Speech
+# Countplot dari jumlah yang sudah diagregasi, dengan nilai di atas setiap bar
+def plot_counts(inputs):
+    counts = inputs["counts"]
     plt.figure(figsize=(10, 5))
-    ax = sns.countplot(x='HS', data=dataset)
-    plt.title('Distribusi Hate Speech di Tweet')
-    plt.xlabel('Hate Speech (1 = Ada, 0 = Tidak Ada)')
+    ax = sns.barplot(x=list(counts.keys()), y=list(counts.values()))
+    plt.title(inputs["title"])
+    plt.xlabel(inputs["xlabel"])
     plt.ylabel('Jumlah Tweet')
 
     # Tambahkan nilai di atas bar
@@ -97,50 +62,129 @@ def main():
         ax.annotate(f'{int(p.get_height())}', (p.get_x() + p.get_width() / 2., p.get_height()),
                     ha='center', va='baseline', fontsize=12, color='black', xytext=(0, 5),
                     textcoords='offset points')
-    plt.show()
-
-    # 2. Visualisasi Distribusi Abusive Speech
-    plt.figure(figsize=(10, 5))
-    ax = sns.countplot(x='Abusive', data=dataset)
-    plt.title('Distribusi Abusive Speech di Tweet')
-    plt.xlabel('Abusive Speech (1 = Ada, 0 = Tidak Ada)')
-    plt.ylabel('Jumlah Tweet')
-
-    # Tambahkan nilai di atas bar
-    for p in ax.patches:
-        ax.annotate(f'{int(p.get_height())}', (p.get_x() + p.get_width() / 2., p.get_height()),
-                    ha='center', va='baseline', fontsize=12, color='black', xytext=(0, 5),
-                    textcoords='offset points')
-    plt.show()
-
-    # 3. Visualisasi Korelasi Antar Variabel Hate Speech (Heatmap)
-    hs_columns = ['HS', 'HS_Individual', 'HS_Group', 'HS_Religion', 'HS_Race', 'HS_Physical',
-                  'HS_Gender', 'HS_Other', 'HS_Weak', 'HS_Moderate', 'HS_Strong']
-    correlation_matrix = dataset[hs_columns].corr()
 
+def plot_correlation(inputs):
     plt.figure(figsize=(12, 8))
-    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', vmin=-1, vmax=1)
+    sns.heatmap(correlation_frame(inputs), annot=True, cmap='coolwarm', vmin=-1, vmax=1)
     plt.title('Korelasi Antar Variabel Hate Speech')
-    plt.show()
 
-    # 4. Visualisasi Perbandingan Hate Speech dan Abusive Speech
-    dataset['HS_Abusive'] = dataset.apply(lambda row: 'HS & Abusive' if row['HS'] == 1 and row['Abusive'] == 1
-                                          else 'HS Only' if row['HS'] == 1
-                                          else 'Abusive Only' if row['Abusive'] == 1
-                                          else 'Neither', axis=1)
-
-    plt.figure(figsize=(10, 5))
-    ax = sns.countplot(x='HS_Abusive', data=dataset)
-    plt.title('Perbandingan Hate Speech dan Abusive Speech')
-    plt.xlabel('Kategori')
-    plt.ylabel('Jumlah Tweet')
-
-    # Tambahkan nilai di atas bar
-    for p in ax.patches:
-        ax.annotate(f'{int(p.get_height())}', (p.get_x() + p.get_width() / 2., p.get_height()),
-                    ha='center', va='baseline', fontsize=12, color='black', xytext=(0, 5),
-                    textcoords='offset points')
-    plt.show()
+# Daftar grafik: (nama file, fungsi plot, input grafik). Input hanya berisi agregat yang dipakai grafik itu,
+# jadi hash-nya berubah hanya jika grafik tersebut memang berubah.
+def figure_specs(analytics):
+    distributions = analytics["distributions"]
+    hs_abusive = {category: analytics["hs_abusive"][category] for category in analytics["hs_abusive_order"]}
+    return [
+        # 1. Visualisasi Distribusi Hate Speech
+        ('countplot-distribution_of_hate_speech.png', plot_counts,
+         {"counts": distributions['HS'], "title": 'Distribusi Hate Speech di Tweet',
+          "xlabel": 'Hate Speech (1 = Ada, 0 = Tidak Ada)'}),
+        # 2. Visualisasi Distribusi Abusive Speech
+        ('countplot-distribution_of_abusive_speech.png', plot_counts,
+         {"counts": distributions['Abusive'], "title": 'Distribusi Abusive Speech di Tweet',
+          "xlabel": 'Abusive Speech (1 = Ada, 0 = Tidak Ada)'}),
+        # 3. Visualisasi Korelasi Antar Variabel Hate Speech (Heatmap)
+        ('heatmap-correlation_between_hate_speech_variables.png', plot_correlation,
+         {"correlation_columns": analytics["correlation_columns"], "correlation": analytics["correlation"]}),
+        # 4. Visualisasi Perbandingan Hate Speech dan Abusive Speech
+        ('countplot-comparison_of_hate_speech_and_abusive.png', plot_counts,
+         {"counts": hs_abusive, "title": 'Perbandingan Hate Speech dan Abusive Speech', "xlabel": 'Kategori'}),
+    ]
+
+def inputs_hash(inputs):
+    return hashlib.sha1(json.dumps([RENDER_FORMAT, inputs]).encode('utf-8')).hexdigest()
+
+# Render satu grafik ke file PNG (dijalankan di worker process, backend Agg tanpa GUI)
+def render_figure(plot, inputs, path):
+    plt.switch_backend('Agg')
+    plot(inputs)
+    plt.savefig(path, bbox_inches='tight')
+    plt.close('all')
+    return path
+
+# Render semua grafik ke output_dir secara paralel; grafik yang inputnya sama dengan render terakhir dilewati
+def render_all(analytics, output_dir, workers=0, force=False):
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, RENDER_MANIFEST)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    pending = []
+    for filename, plot, inputs in figure_specs(analytics):
+        path = os.path.join(output_dir, filename)
+        digest = inputs_hash(inputs)
+        if not force and manifest.get(filename) == digest and os.path.exists(path):
+            print(f"Unchanged, skipped: {path}")
+            continue
+        pending.append((filename, plot, inputs, path, digest))
+
+    if workers == 0:
+        workers = min(len(pending), os.cpu_count() or 1)
+    if workers <= 1:
+        for _, plot, inputs, path, _ in pending:
+            render_figure(plot, inputs, path)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(render_figure, plot, inputs, path) for _, plot, inputs, path, _ in pending]
+            for future in futures:
+                future.result()
+
+    for filename, _, _, path, digest in pending:
+        manifest[filename] = digest
+        print(f"Rendered: {path}")
+    tmp_path = f'{manifest_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return [path for _, _, _, path, _ in pending]
+
+# Fungsi utama untuk melakukan eksplorasi data dan visualisasi.
+# output_dir=None menampilkan grafik secara interaktif (plt.show); selain itu grafik ditulis ke file PNG.
+def main(workers=1, clean=False, output_dir=None, render_workers=0, force=False):
+    # Utamakan index label bit-packed, lalu output kolumnar (hanya kolom label yang dibaca),
+    # lalu CSV hasil cleansing, lalu dataset mentah
+    source_path = LabelIndex.path_for(CLEANED_DATASET_PATH) if LabelIndex.is_fresh(CLEANED_DATASET_PATH) \
+        else find_columnar(CLEANED_DATASET_PATH)
+    if source_path is None:
+        source_path = CLEANED_DATASET_PATH if os.path.exists(CLEANED_DATASET_PATH) else DATASET_PATH
+    if clean:
+        # Muat dan bersihkan data
+        dataset, abusive_words, kamusalay = load_and_clean_data()
+
+        # Terapkan pembersihan pada kolom tweet (regex dan kamus dikompilasi sekali)
+        cleaner = TextCleaner(kamusalay, abusive_words)
+        dataset['cleaned_tweet'] = cleaner.clean_many(dataset['Tweet'], workers=workers)
+
+        # Simpan dataset yang sudah dibersihkan
+        dataset.to_csv('cleaned_dataset_final.csv', index=False)
+        print("Dataset sudah dibersihkan dan disimpan ke 'cleaned_dataset_final.csv'")
+        source_path = 'cleaned_dataset_final.csv'
+
+    # Semua agregat label dihitung sekali (atau diambil dari cache jika dataset tidak berubah)
+    analytics = load_analytics(source_path, ANALYTICS_CACHE_PATH)
+
+    if output_dir is not None:
+        plt.switch_backend('Agg')
+        render_all(analytics, output_dir, workers=render_workers, force=force)
+        return
+
+    for _, plot, inputs in figure_specs(analytics):
+        plot(inputs)
+        plt.show()
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Jumlah worker process untuk cleansing dataset (0 = semua core)')
+    parser.add_argument('--clean', action='store_true',
+                        help='Bersihkan ulang dataset dan tulis cleaned_dataset_final.csv sebelum membuat grafik')
+    parser.add_argument('--output-dir',
+                        help='Tulis grafik sebagai PNG ke direktori ini (backend Agg, tanpa GUI) alih-alih plt.show()')
+    parser.add_argument('--render-workers', type=int, default=0,
+                        help='Jumlah worker process untuk render grafik (0 = sebanyak grafik, maksimal jumlah core)')
+    parser.add_argument('--force', action='store_true', help='Render ulang semua grafik walaupun tidak berubah')
+    args = parser.parse_args()
+    main(workers=args.workers, clean=args.clean, output_dir=args.output_dir,
+         render_workers=args.render_workers, force=args.force)
@@ -0,0 +1,9 @@
+# Entry point WSGI untuk produksi: kamus dimuat sekali saat modul diimpor (di master process gunicorn
+# dengan preload_app), lalu worker hasil fork memakainya bersama secara copy-on-write.
+# Pipeline batch main() tidak dijalankan di sini. Thread background tidak dijalankan di master; setiap
+# worker menjalankannya saat start (post_worker_init di gunicorn.conf.py).
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+from app import create_app, load_text_cleaner, KAMUSALAY_PATH, ABUSIVE_PATH, CLEANER_ARTIFACT_PATH
+
+app = create_app(load_text_cleaner(KAMUSALAY_PATH, ABUSIVE_PATH, CLEANER_ARTIFACT_PATH), start_threads=False)